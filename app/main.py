@@ -5,10 +5,14 @@ from anonymous_board.adapter.input.web.anonymous_board_router import anonymous_b
 from board.adapter.input.web.board_router import board_router
 from cart.adapter.input.web.cart_router import cart_router
 from config.database.session import Base, engine
+from config.openai.config import close_async_openai_client
 # from documents.adapter.input.web.documents_router import documents_router
 from documents_openai.adapter.input.web.documents_openai_router import documents_openai_router
+from documents_openai.infrastructure.external.pdf_extractor import shutdown_pdf_pool
 
 # from documents_multi_agents.adapter.input.web.document_multi_agent_router import documents_multi_agents_router
+from documents_multi_agents.infrastructure.external.download_agent import close_download_session
+from documents_multi_agents.infrastructure.external.inference_server import InferenceServer, shutdown_inference_server
 from financial_news.adapter.input.web.financial_news_router import financial_news_router
 from kakao_authentication.adapter.input.web.kakao_authentication_router import kakao_authentication_router
 from market_data.adapter.input.web.market_data_router import market_data_router
@@ -37,6 +41,12 @@ app.add_middleware(
     allow_headers=["*"],         # 모든 헤더 허용
 )
 
+# 공유 OpenAI 커넥션 풀, PDF 추출 프로세스 풀, 로컬 모델 추론 워커, 문서 다운로드 세션 정리
+app.add_event_handler("shutdown", close_async_openai_client)
+app.add_event_handler("shutdown", shutdown_pdf_pool)
+app.add_event_handler("shutdown", close_download_session)
+app.add_event_handler("shutdown", shutdown_inference_server)
+
 app.include_router(anonymous_board_router, prefix="/anonymouse-board")
 app.include_router(authentication_router, prefix="/authentication")
 app.include_router(board_router, prefix="/board")
@@ -51,8 +61,31 @@ app.include_router(kakao_authentication_router, prefix="/kakao-authentication")
 # 앱 실행
 if __name__ == "__main__":
     import uvicorn
+    from documents_multi_agents.infrastructure.external.model_registry import ModelRegistry
     host = os.getenv("APP_HOST")
     port = int(os.getenv("APP_PORT"))
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
-    uvicorn.run(app, host=host, port=port)
+
+    # 문서 멀티 에이전트 transformers 모델을 기동 시 미리 로드 (워커 fork 전에 로드하면 워커 간 공유)
+    # 추론 서버를 쓰면 모델은 추론 워커 프로세스가 소유하므로 여기서는 로드하지 않음
+    warm_up = os.getenv("DOCUMENTS_MULTI_AGENTS_WARMUP", "false").lower() == "true"
+    workers = int(os.getenv("APP_WORKERS", "1"))
+    in_process_models = not InferenceServer.getInstance().enabled
+    if workers > 1 and in_process_models:
+        # fork 전에 torch 스레드 풀이 만들어지면 워커에서 추론이 멈출 수 있으므로 단일 스레드로 고정
+        # (워커 수만큼 프로세스가 나뉘므로 워커당 1스레드가 코어 몫에도 맞음, 부모는 로드만 하고 추론하지 않음)
+        ModelRegistry.getInstance().set_threads(1)
+    if warm_up and in_process_models:
+        print(f"[APP] model warm-up: {ModelRegistry.getInstance().warm_up()}")
+
+    if workers > 1:
+        from app.prefork import run_prefork
+
+        def before_fork():
+            engine.dispose()  # DB 커넥션은 워커별로 새로 맺도록 함
+            ModelRegistry.prepare_for_fork()
+
+        run_prefork(app, host, port, workers, before_fork=before_fork)
+    else:
+        uvicorn.run(app, host=host, port=port)
@@ -0,0 +1,43 @@
+import multiprocessing
+import socket
+from typing import Callable, Optional
+
+import uvicorn
+
+
+def _serve(app, sock: socket.socket):
+    try:
+        uvicorn.Server(uvicorn.Config(app)).run(sockets=[sock])
+    except KeyboardInterrupt:
+        pass
+
+
+# 부모 프로세스에서 소켓을 열고 (필요하면 모델 등을 미리 로드한 뒤) 워커들을 fork
+# uvicorn --workers는 spawn으로 워커를 띄워 워커마다 모델을 다시 로드하므로,
+# fork로 띄워 부모가 로드한 메모리를 워커들이 copy-on-write로 공유하도록 함
+# before_fork까지 부모에서 스레드를 띄우는 작업(torch 추론 등)을 하면 안 됨: fork된 워커에는 스레드가 복제되지 않아
+# 잠금을 쥔 채 멈춘 스레드 풀 때문에 교착될 수 있음 (torch는 단일 스레드로 고정하고 로드만 하거나, 추론 서버의 spawn 워커를 사용)
+def run_prefork(app, host: str, port: int, workers: int, before_fork: Optional[Callable[[], None]] = None):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    if before_fork is not None:
+        before_fork()
+
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_serve, args=(app, sock), daemon=False) for _ in range(max(1, workers))]
+    for process in processes:
+        process.start()
+    print(f"[APP] {len(processes)} workers forked on {host}:{port}")
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+    finally:
+        sock.close()
@@ -0,0 +1,205 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse, JSONResponse
+
+# 응답 본문용 단어 (토큰 수 ≈ 단어 수)
+WORDS = (
+    "revenue growth margin outlook guidance demand supply cost risk market segment quarter "
+    "operating cash flow investment strategy customer product region forecast expansion"
+).split()
+
+
+@dataclass
+class FakeServerConfig:
+    """로컬 OpenAI 호환 서버 설정 (실제 API 비용 없이 지연/레이트 리밋 재현)"""
+    latency_ms: float = 300.0                 # 요청당 기본 지연
+    latency_per_token_ms: float = 0.5         # 생성 토큰당 추가 지연 (스트리밍 없는 생성 시간 흉내)
+    jitter_ms: float = 50.0                   # 지연 무작위 편차
+    rate_limit_rate: float = 0.0              # 429를 돌려줄 확률
+    tokens_per_minute: int = 0                # 0보다 크면 분당 토큰 초과 시 429
+    completion_tokens: int = 120              # 응답 토큰 수 (max_tokens를 넘지 않음)
+    embedding_dim: int = 256
+    files_dir: Optional[str] = None           # /files/{name}으로 제공할 PDF 디렉토리 (다운로드 벤치마크용)
+    seed: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def create_app(config: FakeServerConfig) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(config.seed)
+    stats = {"chat_requests": 0, "embedding_requests": 0, "rate_limited": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    window = {"started": time.monotonic(), "tokens": 0}
+
+    def rate_limited(tokens: int) -> Optional[JSONResponse]:
+        now = time.monotonic()
+        if now - window["started"] >= 60:
+            window["started"], window["tokens"] = now, 0
+
+        over_budget = config.tokens_per_minute > 0 and window["tokens"] + tokens > config.tokens_per_minute
+        if not over_budget and rng.random() >= config.rate_limit_rate:
+            window["tokens"] += tokens
+            return None
+
+        stats["rate_limited"] += 1
+        retry_after = 60 - (now - window["started"]) if over_budget else 0.2
+        return JSONResponse(
+            {"error": {"message": "Rate limit reached (fake server)", "type": "requests", "code": "rate_limit_exceeded"}},
+            status_code=429,
+            headers={"retry-after-ms": str(int(retry_after * 1000))}
+        )
+
+    async def simulate_latency(completion_tokens: int = 0):
+        delay = config.latency_ms + completion_tokens * config.latency_per_token_ms + rng.uniform(-1, 1) * config.jitter_ms
+        await asyncio.sleep(max(0.0, delay) / 1000)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = min(config.completion_tokens, body.get("max_tokens") or config.completion_tokens)
+
+        if (error := rate_limited(prompt_tokens + completion_tokens)) is not None:
+            return error
+        stats["chat_requests"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += completion_tokens
+        await simulate_latency(completion_tokens)
+
+        # 같은 프롬프트에는 같은 응답 (temperature=0 캐시 동작 확인용)
+        words = random.Random(hashlib.sha256(prompt.encode()).digest())
+        text = " ".join(words.choice(WORDS) for _ in range(completion_tokens))
+        if "JSON" in prompt:
+            text = json.dumps({"sentiment": "neutral", "key_points": text.split()[:5]})
+
+        return {
+            "id": f"chatcmpl-fake-{stats['chat_requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input", [])
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        prompt_tokens = sum(estimate_tokens(str(text)) for text in inputs)
+
+        if (error := rate_limited(prompt_tokens)) is not None:
+            return error
+        stats["embedding_requests"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        await simulate_latency()
+
+        def vector(text: str):
+            seed = random.Random(hashlib.sha256(str(text).encode()).digest())
+            return [seed.uniform(-1, 1) for _ in range(config.embedding_dim)]
+
+        return {
+            "object": "list",
+            "model": body.get("model", "fake"),
+            "data": [{"object": "embedding", "index": idx, "embedding": vector(text)} for idx, text in enumerate(inputs)],
+            "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens}
+        }
+
+    @app.get("/files/{name}")
+    async def get_file(name: str):
+        if not config.files_dir:
+            return JSONResponse({"detail": "files_dir not configured"}, status_code=404)
+        path = os.path.join(config.files_dir, os.path.basename(name))
+        if not os.path.exists(path):
+            return JSONResponse({"detail": "Not found"}, status_code=404)
+        return FileResponse(path, media_type="application/pdf")
+
+    @app.get("/stats")
+    async def get_stats():
+        return {**stats, "config": asdict(config)}
+
+    app.state.stats = stats
+    return app
+
+
+class FakeOpenAIServer:
+    """uvicorn을 별도 스레드(별도 이벤트 루프)에서 실행하여 벤치마크 대상과 루프를 공유하지 않음"""
+
+    def __init__(self, config: FakeServerConfig, host: str = "127.0.0.1", port: int = 8765):
+        import uvicorn
+
+        self.app = create_app(config)
+        self.host = host
+        self.port = port
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="warning"))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stats(self) -> dict:
+        return dict(self.app.state.stats)
+
+    def start(self, timeout: float = 10.0):
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake OpenAI server did not start")
+            time.sleep(0.05)
+        return self
+
+    def stop(self):
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible server for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-per-token-ms", type=float, default=0.5)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--tokens-per-minute", type=int, default=0)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--files-dir", default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(create_app(FakeServerConfig(
+        latency_ms=args.latency_ms,
+        latency_per_token_ms=args.latency_per_token_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_rate=args.rate_limit_rate,
+        tokens_per_minute=args.tokens_per_minute,
+        completion_tokens=args.completion_tokens,
+        files_dir=args.files_dir
+    )), host=args.host, port=args.port)
@@ -0,0 +1,113 @@
+import os
+import resource
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _rss_of(pid: str) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _child_pids(pid: int) -> List[str]:
+    children = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # pid (comm) state ppid ... : comm에 공백이 있을 수 있으므로 마지막 ')' 이후를 파싱
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(entry)
+    return children
+
+
+def current_rss() -> int:
+    """현재 프로세스 + 자식 프로세스(PDF 추출/OCR 풀 워커) RSS 합 (bytes)"""
+    if os.path.exists("/proc/self/statm"):
+        return _rss_of("self") + sum(_rss_of(pid) for pid in _child_pids(os.getpid()))
+    # /proc이 없는 환경에서는 현재 프로세스의 최대 RSS로 대체 (macOS는 bytes, Linux는 KB)
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if os.uname().sysname == "Darwin" else maxrss * 1024
+
+
+class RssSampler:
+    """측정 구간 동안 주기적으로 RSS를 읽어 최댓값 기록"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self.baseline = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.baseline = self.peak = current_rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+@dataclass
+class StageResult:
+    pipeline: str
+    stage: str
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    elapsed_s: float = 0.0
+    peak_rss_bytes: int = 0
+    baseline_rss_bytes: int = 0
+    skipped: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        completed = len(self.latencies_ms)
+        return {
+            "pipeline": self.pipeline,
+            "stage": self.stage,
+            "skipped": self.skipped,
+            "requests": completed + len(self.errors),
+            "errors": len(self.errors),
+            "error_samples": self.errors[:3],
+            "p50_ms": round(percentile(self.latencies_ms, 0.50), 1),
+            "p95_ms": round(percentile(self.latencies_ms, 0.95), 1),
+            "max_ms": round(max(self.latencies_ms, default=0.0), 1),
+            "throughput_per_s": round(completed / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+            "peak_rss_mb": round(self.peak_rss_bytes / 2 ** 20, 1),
+            "rss_delta_mb": round((self.peak_rss_bytes - self.baseline_rss_bytes) / 2 ** 20, 1)
+        }
+
+
+def now_ms() -> float:
+    return time.perf_counter() * 1000
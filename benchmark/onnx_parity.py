@@ -0,0 +1,193 @@
+"""torch / ONNX Runtime int8 백엔드 정합성 + 속도 비교
+
+같은 입력을 두 백엔드로 실행하여 출력 유사도(단어 단위), 단건 p50/p95 지연 시간, 배치 처리량,
+모델 로드 시간과 RSS 증가량을 비교한다. 백엔드별로 별도 프로세스에서 실행하여 RSS가 섞이지 않게 한다.
+
+    python -m benchmark.onnx_parity --models summarizer,qa --samples 16 --output onnx_parity.json
+
+--min-similarity보다 평균 유사도가 낮은 모델이 있으면 종료 코드 1을 반환한다.
+"""
+import argparse
+import difflib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmark.metrics import percentile
+from benchmark.pdf_corpus import make_sentence
+
+BACKENDS = ("torch", "onnx")
+QUESTION = "What drove the change in operating margin?"
+# summarizers.py의 호출 인자와 같게 맞춤 (bullet 요약, answer_agent)
+GENERATION_KWARGS = {
+    "summarizer": {"max_length": 180, "min_length": 40, "truncation": True},
+    "qa": {"max_new_tokens": 150}
+}
+
+
+def build_inputs(name: str, samples: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(samples):
+        # 청크 최대 길이(1000자) 근처까지 문장을 채움
+        paragraph = ""
+        while len(paragraph) < rng.randint(400, 1000):
+            paragraph += make_sentence(rng) + " "
+        if name == "qa":
+            paragraph = f"Context:\n{paragraph.strip()}\n\nQuestion:\n{QUESTION}\n\nAnswer strictly based on the context above.\nAnswer:"
+        inputs.append(paragraph.strip())
+    return inputs
+
+
+def _output_text(output: dict) -> str:
+    return output.get("summary_text", output.get("generated_text", ""))
+
+
+def _run_backend(backend: str, name: str, inputs: List[str], batch_size: int, conn):
+    # 백엔드마다 새 프로세스에서 로드하여 로드 시간과 RSS를 독립적으로 측정
+    try:
+        from documents_multi_agents.infrastructure.external.inference_server import run_sorted_batch
+        from documents_multi_agents.infrastructure.external.model_registry import ModelRegistry, current_rss
+
+        registry = ModelRegistry.getInstance()
+        registry.backend = backend
+        rss_before = current_rss()
+        model = registry.get(name)
+        kwargs = GENERATION_KWARGS[name]
+
+        run_sorted_batch(model, inputs[:1], 1, **kwargs)  # 첫 호출의 초기화 비용은 제외
+
+        outputs, latencies = [], []
+        for text in inputs:
+            started = time.perf_counter()
+            outputs.append(_output_text(run_sorted_batch(model, [text], 1, **kwargs)[0]))
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        run_sorted_batch(model, inputs, batch_size, **kwargs)
+        batch_seconds = time.perf_counter() - started
+
+        conn.send({
+            "backend": backend,
+            "load_seconds": registry.stats()["models"][name]["load_seconds"],
+            "model_mb": registry.stats()["models"][name]["param_mb"],
+            "rss_delta_mb": round((current_rss() - rss_before) / 2 ** 20, 1),
+            "p50_ms": round(percentile(latencies, 0.50), 1),
+            "p95_ms": round(percentile(latencies, 0.95), 1),
+            "batch_throughput_per_s": round(len(inputs) / batch_seconds, 2) if batch_seconds else 0.0,
+            "outputs": outputs
+        })
+    except Exception as e:
+        conn.send({"backend": backend, "error": f"{type(e).__name__}: {str(e)}"})
+    finally:
+        conn.close()
+
+
+def run_backend(backend: str, name: str, inputs: List[str], batch_size: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_run_backend, args=(backend, name, inputs, batch_size, child_conn))
+    process.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = {"backend": backend, "error": f"worker exited with code {process.exitcode}"}
+    process.join()
+    return result
+
+
+def similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a.split(), b.split()).ratio()
+
+
+def compare(name: str, results: Dict[str, dict]) -> dict:
+    torch_result, onnx_result = results["torch"], results["onnx"]
+    report = {"model": name, **{backend: {k: v for k, v in r.items() if k != "outputs"} for backend, r in results.items()}}
+    if "error" in torch_result or "error" in onnx_result:
+        return report
+
+    scores = [similarity(a, b) for a, b in zip(torch_result["outputs"], onnx_result["outputs"])]
+    report["parity"] = {
+        "mean_similarity": round(sum(scores) / len(scores), 3) if scores else 0.0,
+        "min_similarity": round(min(scores, default=0.0), 3),
+        "exact_match_rate": round(sum(1 for s in scores if s == 1.0) / len(scores), 3) if scores else 0.0,
+        "samples": [
+            {"torch": a, "onnx": b}
+            for a, b in list(zip(torch_result["outputs"], onnx_result["outputs"]))[:2]
+        ]
+    }
+    report["speedup_p50"] = round(torch_result["p50_ms"] / onnx_result["p50_ms"], 2) if onnx_result["p50_ms"] else 0.0
+    report["rss_ratio"] = (
+        round(onnx_result["rss_delta_mb"] / torch_result["rss_delta_mb"], 2) if torch_result["rss_delta_mb"] else 0.0
+    )
+    return report
+
+
+def print_report(reports: List[dict]):
+    header = f"{'model':<11}{'backend':<8}{'load_s':>8}{'model_mb':>10}{'rss_mb':>9}{'p50_ms':>9}{'p95_ms':>9}{'batch/s':>9}"
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        for backend in BACKENDS:
+            r = report[backend]
+            if "error" in r:
+                print(f"{report['model']:<11}{backend:<8}  error: {r['error']}")
+                continue
+            print(
+                f"{report['model']:<11}{backend:<8}{r['load_seconds']:>8}{r['model_mb']:>10}{r['rss_delta_mb']:>9}"
+                f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['batch_throughput_per_s']:>9}"
+            )
+        if "parity" in report:
+            parity = report["parity"]
+            print(
+                f"{'':<11}speedup p50 x{report['speedup_p50']}, rss x{report['rss_ratio']}, "
+                f"similarity mean {parity['mean_similarity']} / min {parity['min_similarity']}, "
+                f"exact {parity['exact_match_rate']}"
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Parity and speed comparison of the torch and ONNX int8 backends")
+    parser.add_argument("--models", default=",".join(GENERATION_KWARGS), help=f"comma separated: {tuple(GENERATION_KWARGS)}")
+    parser.add_argument("--samples", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--min-similarity", type=float, default=0.8, help="required mean word-level similarity")
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    reports = []
+    for name in [m.strip() for m in args.models.split(",") if m.strip()]:
+        inputs = build_inputs(name, args.samples)
+        results = {}
+        for backend in BACKENDS:
+            print(f"[BENCH] {name} / {backend}: {len(inputs)} inputs")
+            results[backend] = run_backend(backend, name, inputs, args.batch_size)
+        reports.append(compare(name, results))
+
+    print_report(reports)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"created_at": time.time(), "samples": args.samples, "models": reports}, f, indent=2)
+        print(f"[BENCH] report written to {args.output}")
+
+    failed = [r["model"] for r in reports if "parity" not in r or r["parity"]["mean_similarity"] < args.min_similarity]
+    if failed:
+        print(f"[BENCH] parity check failed: {failed}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import os
+import random
+from typing import Dict, List
+
+import fitz  # PyMuPDF
+
+# 문서 크기별 페이지 수
+CORPUS_SIZES: Dict[str, int] = {
+    "small": 4,
+    "medium": 40,
+    "large": 200
+}
+
+SUBJECTS = ["Revenue", "Operating margin", "Net income", "Capital expenditure", "Free cash flow", "Guidance",
+            "The memory segment", "Overseas demand", "The board", "Inventory"]
+VERBS = ["increased", "declined", "remained flat", "was revised", "exceeded expectations", "is expected to recover"]
+DETAILS = ["compared to the previous quarter", "due to higher input costs", "driven by strong export demand",
+           "despite currency headwinds", "in line with management guidance", "after the restructuring program"]
+
+
+def make_sentence(rng: random.Random) -> str:
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} by {rng.randint(1, 40)}% {rng.choice(DETAILS)}."
+
+
+def generate_pdf(path: str, pages: int, salt: str = "", sentences_per_page: int = 30, scanned_ratio: float = 0.0) -> str:
+    """재현 가능한 재무 보고서 형태의 PDF 생성
+
+    salt가 다르면 내용이 달라지므로 캐시를 거치지 않는 (cold) 측정에 사용하고,
+    scanned_ratio 비율의 페이지는 텍스트 레이어 없이 이미지로만 넣어 OCR 경로를 측정한다.
+    """
+    rng = random.Random(f"{pages}:{salt}")
+    doc = fitz.open()
+    for page_no in range(pages):
+        page = doc.new_page()
+        text = f"Section {page_no + 1} {salt}\n" + " ".join(make_sentence(rng) for _ in range(sentences_per_page))
+        rect = fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50)
+
+        if rng.random() < scanned_ratio:
+            # 텍스트를 그린 임시 페이지를 이미지로 바꿔 넣어 스캔 페이지를 흉내
+            scratch = fitz.open()
+            scratch_page = scratch.new_page()
+            scratch_page.insert_textbox(rect, text, fontsize=9)
+            page.insert_image(page.rect, pixmap=scratch_page.get_pixmap(dpi=150))
+            scratch.close()
+        else:
+            page.insert_textbox(rect, text, fontsize=9)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def build_corpus(directory: str, sizes: List[str], count: int, salt: str = "", scanned_ratio: float = 0.0) -> List[dict]:
+    """크기별로 count개씩 PDF를 만들고 [{"size", "name", "path", "pages"}] 반환"""
+    os.makedirs(directory, exist_ok=True)
+    corpus = []
+    for size in sizes:
+        pages = CORPUS_SIZES[size]
+        for idx in range(count):
+            name = f"{size}-{salt or 'base'}-{idx}.pdf"
+            path = generate_pdf(os.path.join(directory, name), pages, salt=f"{salt}-{idx}", scanned_ratio=scanned_ratio)
+            corpus.append({"size": size, "name": name, "path": path, "pages": pages})
+    return corpus
@@ -0,0 +1,345 @@
+"""문서 파이프라인 오프라인 벤치마크
+
+로컬 OpenAI 호환 서버(fake_openai_server)와 생성한 PDF 코퍼스로 실제 API 비용 없이
+documents_openai / documents_multi_agents 파이프라인의 단계별 p50/p95 지연 시간, 처리량, 최대 RSS를 측정한다.
+
+    python -m benchmark.run_benchmark --pipelines documents_openai --sizes small,medium --requests 20 --concurrency 4
+    python -m benchmark.run_benchmark --cache warm --output after.json --baseline before.json
+
+--baseline을 주면 p95 지연 시간이나 처리량이 threshold 이상 나빠진 단계를 출력하고 종료 코드 1을 반환한다.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmark.fake_openai_server import FakeOpenAIServer, FakeServerConfig
+from benchmark.metrics import RssSampler, StageResult, now_ms
+from benchmark.pdf_corpus import CORPUS_SIZES, build_corpus
+
+PIPELINES = ("documents_openai", "documents_multi_agents")
+QUESTION = "What drove the change in operating margin?"
+# 모델 단계 실행 전 로드 가능 여부를 확인할 때 쓰는 짧은 입력
+PROBE_TEXT = "Revenue grew in the third quarter while operating costs stayed flat."
+
+
+def configure_environment(workdir: str, base_url: str, cache_mode: str):
+    # 파이프라인 모듈은 import 시점에 환경변수를 읽으므로 import 전에 설정
+    os.environ["OPENAI_API_KEY"] = "sk-benchmark"      # 실제 키로 과금되지 않도록 항상 덮어씀
+    os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+    os.environ["DOCUMENTS_OPENAI_CACHE_REDIS"] = "false"
+    os.environ["DOCUMENTS_OPENAI_PROMPT_CACHE_REDIS"] = "false"
+    os.environ["DOCUMENTS_OPENAI_OCR_CACHE_REDIS"] = "false"
+    os.environ["DOCUMENTS_OPENAI_PROMPT_CACHE"] = "true" if cache_mode == "warm" else "false"
+    os.environ["DOCUMENTS_OPENAI_INDEX_DIR"] = os.path.join(workdir, "index")
+    # cold 모드에서는 --workdir를 재사용해도 이전 실행의 다운로드/추출 텍스트 캐시를 쓰지 않도록 실행마다 새 디렉토리 사용
+    downloads = "warm" if cache_mode == "warm" else f"cold-{time.time_ns()}"
+    os.environ["DOCUMENTS_MULTI_AGENTS_DOWNLOAD_DIR"] = os.path.join(workdir, "downloads", downloads)
+    # 상대 경로 캐시 디렉토리(./cache)가 작업 디렉토리 아래에 생기도록 함
+    os.chdir(workdir)
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+async def run_stage(
+    pipeline: str,
+    stage: str,
+    items: List[dict],
+    fn: Callable[[dict], Awaitable[None]],
+    concurrency: int,
+    warmup: bool = False
+) -> StageResult:
+    result = StageResult(pipeline=pipeline, stage=stage)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(item: dict, record: bool):
+        async with semaphore:
+            started = now_ms()
+            try:
+                await fn(item)
+            except Exception as e:
+                if record:
+                    result.errors.append(f"{type(e).__name__}: {str(e)[:200]}")
+                return
+            if record:
+                result.latencies_ms.append(now_ms() - started)
+
+    # warm 모드: 측정 전에 한 번 실행하여 캐시를 채움
+    if warmup:
+        await asyncio.gather(*(run_one(item, record=False) for item in items))
+
+    with RssSampler() as sampler:
+        started = time.perf_counter()
+        await asyncio.gather(*(run_one(item, record=True) for item in items))
+        result.elapsed_s = time.perf_counter() - started
+    result.peak_rss_bytes = sampler.peak
+    result.baseline_rss_bytes = sampler.baseline
+    print(f"[BENCH] {pipeline}.{stage}: {result.to_dict()}")
+    return result
+
+
+async def bench_documents_openai(args, corpus_dir: str) -> List[StageResult]:
+    from documents_openai.application.usecase.document_analysis_usecase import DocumentAnalysisUseCase
+    from documents_openai.infrastructure.external.chunker import chunk_pages
+    from documents_openai.infrastructure.external.openai_agents import extract_pages_from_pdf_clean, \
+        summarize_document, qa_on_document, qa_on_chunks, analyze_opinions
+    from documents_openai.infrastructure.external.pdf_extractor import join_pages, shutdown_pdf_pool
+    from config.openai.config import close_async_openai_client
+
+    warm = args.cache == "warm"
+    pipeline = "documents_openai"
+    items = build_corpus(os.path.join(corpus_dir, "openai"), args.sizes, args.requests, salt="stages",
+                         scanned_ratio=args.scanned_ratio)
+    for item in items:
+        item["doc_hash"] = file_hash(item["path"])
+
+    async def extract(item):
+        item["page_texts"] = await extract_pages_from_pdf_clean(item["path"])
+
+    async def summarize(item):
+        item["summary"] = await summarize_document([chunk.text for chunk in chunk_pages(item["page_texts"])])
+
+    async def qa(item):
+        await qa_on_document(item["summary"], QUESTION)
+
+    async def opinions(item):
+        await analyze_opinions(item["summary"])
+
+    async def qa_retrieval(item):
+        await qa_on_chunks(item["doc_hash"], join_pages(item["page_texts"]), QUESTION)
+
+    results = [await run_stage(pipeline, "extract", items, extract, args.concurrency, warmup=warm)]
+    ready = [item for item in items if "page_texts" in item]
+    results.append(await run_stage(pipeline, "summarize", ready, summarize, args.concurrency, warmup=warm))
+    summarized = [item for item in ready if "summary" in item]
+    results.append(await run_stage(pipeline, "qa", summarized, qa, args.concurrency, warmup=warm))
+    results.append(await run_stage(pipeline, "opinions", summarized, opinions, args.concurrency, warmup=warm))
+    results.append(await run_stage(pipeline, "qa_retrieval", ready, qa_retrieval, args.concurrency, warmup=warm))
+
+    # 전체 파이프라인: cold 모드에서는 앞 단계에서 쌓인 캐시를 피하도록 새 코퍼스 사용
+    usecase = DocumentAnalysisUseCase.getInstance()
+    if warm:
+        analyze_items = items
+    else:
+        analyze_items = build_corpus(os.path.join(corpus_dir, "openai"), args.sizes, args.requests, salt="analyze",
+                                     scanned_ratio=args.scanned_ratio)
+        for item in analyze_items:
+            item["doc_hash"] = file_hash(item["path"])
+
+    async def analyze(item):
+        await usecase.analyze_document(item["doc_hash"], item["path"], QUESTION)
+
+    results.append(await run_stage(pipeline, "analyze", analyze_items, analyze, args.concurrency, warmup=warm))
+
+    await close_async_openai_client()
+    shutdown_pdf_pool()
+    return results
+
+
+async def bench_documents_multi_agents(args, corpus_dir: str, base_url: str) -> List[StageResult]:
+    pipeline = "documents_multi_agents"
+    warm = args.cache == "warm"
+    items = build_corpus(corpus_dir, args.sizes, args.requests, salt="multi", scanned_ratio=args.scanned_ratio)
+
+    try:
+        from documents_multi_agents.infrastructure.external.download_agent import close_download_session, download_to_cache, \
+            release_cached_document
+        from documents_multi_agents.infrastructure.external.parse_agent import parse_cached_document
+    except Exception as e:
+        return [StageResult(pipeline, stage, skipped=f"{type(e).__name__}: {e}") for stage in ("download", "parse")]
+
+    # cold 모드에서는 요청마다 URL을 달리하여 다운로드 캐시를 거치지 않음
+    for idx, item in enumerate(items):
+        item["url"] = f"{base_url}/files/{item['name']}" + ("" if warm else f"?r={idx}-{time.time_ns()}")
+
+    # 받은 파일은 파싱 단계가 끝날 때까지 고정 (warm 모드의 사전 실행에서 고정한 파일은 풀어 줌)
+    async def download(item):
+        path = await download_to_cache(item["url"])
+        if "path" in item:
+            release_cached_document(item["path"])
+        item["path"] = path
+
+    async def parse(item):
+        item["text"] = await parse_cached_document(item["path"])
+
+    results = [await run_stage(pipeline, "download", items, download, args.concurrency, warmup=warm)]
+    downloaded = [item for item in items if "path" in item]
+    results.append(await run_stage(pipeline, "parse", downloaded, parse, args.concurrency, warmup=warm))
+    for item in downloaded:
+        release_cached_document(item["path"])
+    await close_download_session()
+    parsed = [item for item in downloaded if "text" in item]
+
+    # 로컬 transformers 모델 단계: 모델 가중치가 없는 환경에서는 건너뜀
+    try:
+        from documents_multi_agents.infrastructure.external.summarizers import bullet_summarizer, abstract_summarizer, \
+            casual_summarizer, consensus_summarizer, answer_agent, run_model
+    except Exception as e:
+        reason = f"{type(e).__name__}: {e}"
+        return results + [StageResult(pipeline, stage, skipped=reason) for stage in ("summarize", "qa")]
+
+    # 모델은 처음 호출할 때 로드되므로 import 성공만으로는 알 수 없음: 짧은 입력으로 한 번 실행해 로드 가능 여부 확인
+    async def probe(name: str, **kwargs) -> Optional[str]:
+        try:
+            await run_model(name, [PROBE_TEXT], 1, **kwargs)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        return None
+
+    summarizer_error = await probe("summarizer", max_length=20, min_length=5, truncation=True)
+    qa_error = await probe("qa", max_new_tokens=5)
+
+    async def summarize(item):
+        bullet, abstract, casual = await asyncio.gather(
+            bullet_summarizer(item["text"]), abstract_summarizer(item["text"]), casual_summarizer(item["text"])
+        )
+        item["summary"] = await consensus_summarizer([bullet, abstract, casual])
+
+    async def qa(item):
+        await answer_agent(item["summary"], QUESTION)
+
+    if summarizer_error is not None:
+        return results + [StageResult(pipeline, stage, skipped=summarizer_error) for stage in ("summarize", "qa")]
+    results.append(await run_stage(pipeline, "summarize", parsed, summarize, args.concurrency, warmup=warm))
+    summarized = [item for item in parsed if "summary" in item]
+    if qa_error is not None:
+        return results + [StageResult(pipeline, "qa", skipped=qa_error)]
+    results.append(await run_stage(pipeline, "qa", summarized, qa, args.concurrency, warmup=warm))
+    return results
+
+
+def compare_with_baseline(report: dict, baseline: dict, threshold: float) -> List[str]:
+    previous = {(s["pipeline"], s["stage"]): s for s in baseline.get("stages", []) if not s.get("skipped")}
+    regressions = []
+    for stage in report["stages"]:
+        before = previous.get((stage["pipeline"], stage["stage"]))
+        if stage.get("skipped") or before is None:
+            continue
+        name = f"{stage['pipeline']}.{stage['stage']}"
+        if before["p95_ms"] and stage["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {stage['p95_ms']}ms")
+        if before["throughput_per_s"] and stage["throughput_per_s"] < before["throughput_per_s"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {before['throughput_per_s']}/s -> {stage['throughput_per_s']}/s")
+        if stage["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {stage['errors']}")
+    return regressions
+
+
+def print_table(stages: List[dict]):
+    header = f"{'stage':<36}{'n':>5}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'ops/s':>10}{'rss MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for s in stages:
+        name = f"{s['pipeline']}.{s['stage']}"
+        if s.get("skipped"):
+            print(f"{name:<36}skipped ({s['skipped'][:60]})")
+            continue
+        print(f"{name:<36}{s['requests']:>5}{s['errors']:>5}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['max_ms']:>10}"
+              f"{s['throughput_per_s']:>10}{s['peak_rss_mb']:>9}")
+
+
+async def run_all(args, workdir: str, base_url: str) -> List[StageResult]:
+    corpus_dir = os.path.join(workdir, "corpus")
+    results = []
+    if "documents_openai" in args.pipelines:
+        results += await bench_documents_openai(args, corpus_dir)
+    if "documents_multi_agents" in args.pipelines:
+        results += await bench_documents_multi_agents(args, corpus_dir, base_url)
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline benchmark for the document pipelines")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES), help=f"comma separated: {PIPELINES}")
+    parser.add_argument("--sizes", default="small,medium", help=f"comma separated: {tuple(CORPUS_SIZES)}")
+    parser.add_argument("--requests", type=int, default=10, help="documents per size")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--cache", choices=("cold", "warm"), default="cold")
+    parser.add_argument("--scanned-ratio", type=float, default=0.0, help="fraction of image-only pages (OCR path)")
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-per-token-ms", type=float, default=0.5)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--tokens-per-minute", type=int, default=0)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workdir", default=None, help="keep corpus/caches here instead of a temp dir")
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    parser.add_argument("--baseline", default=None, help="previous JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression ratio")
+    args = parser.parse_args(argv)
+
+    args.pipelines = [p for p in args.pipelines.split(",") if p]
+    args.sizes = [s for s in args.sizes.split(",") if s]
+    for pipeline in args.pipelines:
+        if pipeline not in PIPELINES:
+            parser.error(f"unknown pipeline: {pipeline}")
+    for size in args.sizes:
+        if size not in CORPUS_SIZES:
+            parser.error(f"unknown size: {size}")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix="documents-bench-")
+    os.makedirs(os.path.join(workdir, "corpus"), exist_ok=True)
+    original_cwd = os.getcwd()
+
+    server = FakeOpenAIServer(FakeServerConfig(
+        latency_ms=args.latency_ms,
+        latency_per_token_ms=args.latency_per_token_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_rate=args.rate_limit_rate,
+        tokens_per_minute=args.tokens_per_minute,
+        completion_tokens=args.completion_tokens,
+        files_dir=os.path.join(workdir, "corpus")
+    ), port=args.port).start()
+
+    try:
+        configure_environment(workdir, server.base_url, args.cache)
+        results = asyncio.run(run_all(args, workdir, server.base_url))
+    finally:
+        server.stop()
+        os.chdir(original_cwd)
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "workdir")},
+        "llm_server": server.stats,
+        "stages": [result.to_dict() for result in results]
+    }
+    print_table(report["stages"])
+    print(f"[BENCH] fake LLM server: {report['llm_server']}")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            regressions = compare_with_baseline(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"[BENCH] REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
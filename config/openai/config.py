@@ -2,7 +2,8 @@ import os
 from dataclasses import dataclass
 from typing import Optional
 from dotenv import load_dotenv
-from openai import AsyncOpenAI, OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI
+import httpx
 
 load_dotenv()
 
@@ -15,6 +16,11 @@ class OpenAIConfig:
     temperature: float = 0.3
     max_tokens: Optional[int] = None
     timeout: int = 30
+    max_retries: int = 2
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    base_url: Optional[str] = None
 
     def __post_init__(self):
         """초기화 후 검증"""
@@ -36,7 +42,20 @@ class OpenAIConfig:
             model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
             temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.3")),
             max_tokens=int(os.getenv("OPENAI_MAX_TOKENS")) if os.getenv("OPENAI_MAX_TOKENS") else None,
-            timeout=int(os.getenv("OPENAI_TIMEOUT", "30"))
+            timeout=int(os.getenv("OPENAI_TIMEOUT", "30")),
+            max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30")),
+            base_url=os.getenv("OPENAI_BASE_URL") or None  # OpenAI 호환 서버 (벤치마크용 로컬 서버 등)
+        )
+
+    def http_limits(self) -> httpx.Limits:
+        """커넥션 풀 설정"""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
         )
 
 _openai_config: Optional[OpenAIConfig] = None
@@ -55,19 +74,31 @@ def get_openai_config() -> OpenAIConfig:
 
 
 def get_async_openai_client() -> AsyncOpenAI:
-    """비동기 OpenAI 클라이언트 반환 (싱글톤)"""
+    """비동기 OpenAI 클라이언트 반환 (싱글톤, keep-alive 커넥션 풀 공유)"""
     global _async_client
 
     if _async_client is None:
         config = get_openai_config()
         _async_client = AsyncOpenAI(
             api_key=config.api_key,
-            timeout=config.timeout
+            base_url=config.base_url,
+            timeout=config.timeout,
+            max_retries=config.max_retries,
+            http_client=DefaultAsyncHttpxClient(limits=config.http_limits())
         )
 
     return _async_client
 
 
+async def close_async_openai_client():
+    """비동기 클라이언트의 커넥션 풀 정리 (앱 종료 시)"""
+    global _async_client
+
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
 def get_sync_openai_client() -> OpenAI:
     """동기 OpenAI 클라이언트 반환 (싱글톤)"""
     global _sync_client
@@ -76,6 +107,7 @@ def get_sync_openai_client() -> OpenAI:
         config = get_openai_config()
         _sync_client = OpenAI(
             api_key=config.api_key,
+            base_url=config.base_url,
             timeout=config.timeout
         )
 
@@ -23,3 +23,22 @@ def get_redis() -> redis.Redis:
             decode_responses=True
         )
     return _redis_instance
+
+
+# 캐시 전용 Redis 인스턴스 (Singleton): 조회가 요청 경로에 있으므로 짧은 소켓 타임아웃 사용
+REDIS_CACHE_SOCKET_TIMEOUT = float(os.getenv("REDIS_CACHE_SOCKET_TIMEOUT", "0.2"))
+_redis_cache_instance = None
+
+def get_cache_redis() -> redis.Redis:
+    global _redis_cache_instance
+    if _redis_cache_instance is None:
+        _redis_cache_instance = redis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            password=REDIS_PASSWORD,
+            decode_responses=True,
+            socket_timeout=REDIS_CACHE_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_CACHE_SOCKET_TIMEOUT
+        )
+    return _redis_cache_instance
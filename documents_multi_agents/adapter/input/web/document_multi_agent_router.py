@@ -2,6 +2,10 @@ from fastapi import APIRouter, HTTPException
 
 from documents_multi_agents.adapter.input.web.request.analyze_request import AnalyzeRequest
 from documents_multi_agents.application.usecase.document_multi_agent_usecase import DocumentMultiAgentsUseCase
+from documents_multi_agents.infrastructure.external.download_agent import download_cache_stats
+from documents_multi_agents.infrastructure.external.inference_server import InferenceServer
+from documents_multi_agents.infrastructure.external.model_registry import ModelRegistry
+from documents_multi_agents.infrastructure.external.summarizers import summary_cache_stats
 
 documents_multi_agents_router = APIRouter(tags=["documents_multi_agents"])
 
@@ -25,3 +29,27 @@ async def analyze_document(request: AnalyzeRequest):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# 모델 로드 상태 / 로드 시간 / 메모리 사용량 (프로세스 단위)
+@documents_multi_agents_router.get("/models/stats")
+async def get_model_stats():
+    return ModelRegistry.getInstance().stats()
+
+
+# 요약 메모이제이션 적중률 (프로세스 단위)
+@documents_multi_agents_router.get("/summaries/cache/stats")
+async def get_summary_cache_stats():
+    return summary_cache_stats()
+
+
+# 추론 워커 풀 상태 / 마이크로 배치 크기 / 대기 시간 (프로세스 단위)
+@documents_multi_agents_router.get("/inference/stats")
+async def get_inference_stats():
+    return InferenceServer.getInstance().stats()
+
+
+# 다운로드 캐시 적중률 / 재검증 / 용량 (프로세스 단위)
+@documents_multi_agents_router.get("/downloads/cache/stats")
+async def get_download_cache_stats():
+    return await download_cache_stats()
@@ -2,8 +2,8 @@ import asyncio
 
 from documents.infrastructure.repository.document_repository_impl import DocumentRepositoryImpl
 from documents_multi_agents.domain.document_agents import DocumentAgents
-from documents_multi_agents.infrastructure.external.download_agent import download_document, get_cache_filename
-from documents_multi_agents.infrastructure.external.parse_agent import parse_document
+from documents_multi_agents.infrastructure.external.download_agent import cached_document
+from documents_multi_agents.infrastructure.external.parse_agent import parse_cached_document
 from documents_multi_agents.infrastructure.external.summarizers import bullet_summarizer, abstract_summarizer, \
     casual_summarizer, consensus_summarizer, answer_agent
 
@@ -34,12 +34,10 @@ class DocumentMultiAgentsUseCase:
         if not agents:
             agents = DocumentAgents(doc_id=doc_id, doc_url=doc_url)
 
-        # 다운로드
-        content = await download_document(doc_url)
-        cache_path = get_cache_filename(doc_url)
-
-        # 파싱
-        parsed_text = parse_document(content, cache_path)
+        # 다운로드 (캐시 파일 경로만 받고 본문은 메모리에 올리지 않음, 파싱이 끝날 때까지 캐시에서 삭제되지 않음)
+        async with cached_document(doc_url) as cache_path:
+            # 파싱 (같은 내용의 문서는 저장된 추출 텍스트 재사용)
+            parsed_text = await parse_cached_document(cache_path)
         agents.update_parsed_text(parsed_text)
 
         # 병렬 요약
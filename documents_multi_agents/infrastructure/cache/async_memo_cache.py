@@ -0,0 +1,136 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+_MISSING = object()
+
+
+class AsyncMemoCache:
+    """비동기 계산 결과 메모이제이션 (프로세스 내 LRU)
+
+    - 최대 max_entries개를 보관하고 가장 오래 사용하지 않은 항목부터 제거
+    - 같은 키를 동시에 요청하면 진행 중인 계산 하나를 함께 기다림 (중복 계산 없음)
+    - 계산은 별도 태스크에서 실행하므로 처음 요청한 호출이 취소되어도 함께 기다리던 호출은 결과를 받음
+    - 계산이 실패하면 기다리던 호출에도 같은 예외를 전달하고 결과는 저장하지 않음
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(1, max_entries)
+        self._values: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._tasks = set()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def _get(self, key: Hashable) -> Any:
+        if key in self._values:
+            self._values.move_to_end(key)
+            self._stats["hits"] += 1
+            return self._values[key]
+        return _MISSING
+
+    def _put(self, key: Hashable, value: Any):
+        self._values[key] = value
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _reserve(self, key: Hashable) -> asyncio.Future:
+        self._stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def _resolve(self, key: Hashable, future: asyncio.Future, value: Any):
+        self._inflight.pop(key, None)
+        self._put(key, value)
+        if not future.done():
+            future.set_result(value)
+
+    def _fail(self, key: Hashable, future: asyncio.Future, error: BaseException):
+        self._inflight.pop(key, None)
+        if future.done():
+            return
+        if isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(error)
+            future.exception()  # 기다리는 호출이 없어도 "exception never retrieved" 경고가 나지 않도록 함
+
+    def _spawn(self, futures: Dict[Hashable, asyncio.Future], compute: Callable[[], Awaitable[List[Any]]]):
+        # 계산 태스크는 호출과 분리하여 실행하고, 끝날 때까지 참조를 유지 (GC로 중간에 사라지지 않도록)
+        async def run():
+            try:
+                values = await compute()
+            except BaseException as e:
+                for key, future in futures.items():
+                    self._fail(key, future, e)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                return
+            for (key, future), value in zip(futures.items(), values):
+                self._resolve(key, future, value)
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        value = self._get(key)
+        if value is not _MISSING:
+            return value
+        if key in self._inflight:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(self._inflight[key])
+
+        async def compute_one() -> List[Any]:
+            return [await compute()]
+
+        future = self._reserve(key)
+        self._spawn({key: future}, compute_one)
+        return await asyncio.shield(future)
+
+    async def get_or_compute_many(
+        self,
+        keys: List[Hashable],
+        compute_missing: Callable[[List[int]], Awaitable[List[Any]]]
+    ) -> List[Any]:
+        """여러 키를 한 번에 조회하고, 캐시에도 진행 중인 계산에도 없는 키만 모아 한 번에 계산
+
+        compute_missing은 계산할 항목의 인덱스 목록을 받아 같은 순서의 결과 목록을 반환해야 함
+        """
+        results: List[Any] = [_MISSING] * len(keys)
+        waiting: Dict[int, asyncio.Future] = {}
+        owned: Dict[Hashable, int] = {}
+
+        for idx, key in enumerate(keys):
+            value = self._get(key)
+            if value is not _MISSING:
+                results[idx] = value
+            elif key in self._inflight:
+                self._stats["coalesced"] += 1
+                waiting[idx] = self._inflight[key]
+            else:
+                owned[key] = idx
+                waiting[idx] = self._reserve(key)
+
+        if owned:
+            owned_indices = list(owned.values())
+            self._spawn({key: waiting[idx] for key, idx in owned.items()}, lambda: compute_missing(owned_indices))
+
+        for idx, future in waiting.items():
+            results[idx] = await asyncio.shield(future)
+        return results
+
+    def clear(self):
+        self._values.clear()
+
+    def stats(self) -> dict:
+        lookups = self._stats["hits"] + self._stats["misses"] + self._stats["coalesced"]
+        return {
+            **self._stats,
+            "entries": len(self._values),
+            "max_entries": self.max_entries,
+            "inflight": len(self._inflight),
+            "hit_rate": round((self._stats["hits"] + self._stats["coalesced"]) / lookups, 3) if lookups else 0.0
+        }
@@ -1,31 +1,354 @@
-import os
+import asyncio
+import glob
 import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
 import aiohttp
 
-# 캐시 디렉토리 경로 설정
-CACHE_DIR = "./cache"
-os.makedirs(CACHE_DIR, exist_ok=True)
+# 다운로드 캐시 디렉토리 / 전체 용량 한도 (넘으면 가장 오래 사용하지 않은 파일부터 삭제)
+CACHE_DIR = os.getenv("DOCUMENTS_MULTI_AGENTS_DOWNLOAD_DIR", "./cache/documents_multi_agents/downloads")
+CACHE_MAX_BYTES = int(os.getenv("DOCUMENTS_MULTI_AGENTS_DOWNLOAD_CACHE_MB", "1024")) * 2 ** 20
+# 이 시간 안에 확인한 파일은 원본 서버에 다시 묻지 않고 사용 (지나면 ETag/Last-Modified로 재검증)
+FRESH_SECONDS = int(os.getenv("DOCUMENTS_MULTI_AGENTS_DOWNLOAD_FRESH_SECONDS", "300"))
+CHUNK_SIZE = int(os.getenv("DOCUMENTS_MULTI_AGENTS_DOWNLOAD_CHUNK_KB", "256")) * 1024
+MAX_CONNECTIONS = int(os.getenv("DOCUMENTS_MULTI_AGENTS_DOWNLOAD_MAX_CONNECTIONS", "32"))
+TIMEOUT_SECONDS = float(os.getenv("DOCUMENTS_MULTI_AGENTS_DOWNLOAD_TIMEOUT", "120"))
+
+INDEX_FILE = "index.json"
+
+
+class DownloadManager:
+    """문서 다운로드 캐시 (내용 주소 기반, 용량 제한 LRU)
+
+    - 본문은 sha256(내용).pdf로 저장하여 내용이 같은 URL은 파일 하나를 공유하고, URL -> 내용 해시/ETag/Last-Modified는
+      index.json에 기록 (재시작 후에도 유지, 임시 파일에 쓴 뒤 교체)
+    - 공유 aiohttp 세션(커넥션 풀)으로 받고, 본문은 메모리에 모으지 않고 청크 단위로 임시 파일에 기록한 뒤 교체
+    - FRESH_SECONDS가 지난 항목은 If-None-Match / If-Modified-Since로 재검증하여 304면 다시 받지 않음
+      (검증 헤더가 없는 서버의 파일은 기존처럼 캐시된 내용을 계속 사용)
+    - 같은 URL을 동시에 요청하면 진행 중인 다운로드 하나를 함께 기다림
+    - 디렉토리 전체 크기가 CACHE_MAX_BYTES를 넘으면 가장 오래 사용하지 않은 파일(같은 이름의 부가 파일 포함)부터 삭제하되,
+      fetch()로 받아 release()하지 않은 파일(사용 중인 파일)은 삭제하지 않음
+    - 파일 입출력은 스레드에서 수행하고, 삭제 / 새 파일 등록 / 인덱스 저장은 잠금으로 순서를 보장
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.cache_dir = CACHE_DIR
+            cls.__instance.max_bytes = CACHE_MAX_BYTES
+            cls.__instance._session = None
+            cls.__instance._inflight = {}
+            cls.__instance._entries = {}            # url -> {hash, etag, last_modified, validated_at}
+            cls.__instance._blobs = OrderedDict()   # 내용 해시 -> 크기 (LRU 순서)
+            cls.__instance._pins = {}               # 내용 해시 -> 사용 중인 호출 수
+            cls.__instance._loaded = False
+            cls.__instance._load_lock = None
+            cls.__instance._disk_lock = None
+            cls.__instance._stats = {
+                "hits": 0, "misses": 0, "revalidated": 0, "coalesced": 0, "evictions": 0, "downloaded_bytes": 0
+            }
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}.pdf")
+
+    # 잠금은 이벤트 루프 안에서 처음 사용할 때 생성
+    def _locks(self) -> tuple:
+        if self._disk_lock is None:
+            self._load_lock = asyncio.Lock()
+            self._disk_lock = asyncio.Lock()
+        return self._load_lock, self._disk_lock
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        load_lock, _ = self._locks()
+        async with load_lock:
+            if self._loaded:
+                return
+            blobs, entries = await asyncio.to_thread(self._read_disk)
+            self._blobs.update(blobs)
+            self._entries = entries
+            self._loaded = True
+        await self._evict()
+
+    def _read_disk(self) -> tuple:
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        index = {}
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        # 디렉토리의 실제 파일 기준으로 용량을 계산 (인덱스에 없는 파일은 수정 시각 순으로 가장 오래된 쪽에 둠)
+        on_disk = {
+            os.path.basename(path)[:-len(".pdf")]: path
+            for path in glob.glob(os.path.join(self.cache_dir, "*.pdf"))
+        }
+        blobs = OrderedDict()
+        for content_hash in sorted(set(on_disk) - set(index.get("blobs", [])), key=lambda h: os.path.getmtime(on_disk[h])):
+            blobs[content_hash] = self._blob_size(content_hash)
+        for content_hash in index.get("blobs", []):
+            if content_hash in on_disk:
+                blobs[content_hash] = self._blob_size(content_hash)
+        entries = {url: entry for url, entry in index.get("entries", {}).items() if entry["hash"] in blobs}
+        return blobs, entries
+
+    def _blob_size(self, content_hash: str) -> int:
+        return sum(os.path.getsize(path) for path in glob.glob(os.path.join(self.cache_dir, f"{content_hash}.*")))
+
+    def _remove_blobs(self, content_hashes: List[str]):
+        for content_hash in content_hashes:
+            for path in glob.glob(os.path.join(self.cache_dir, f"{content_hash}.*")):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # 인덱스 내용은 잠금 안에서 복사해 두고 스레드에서 임시 파일에 쓴 뒤 교체 (저장 순서대로 반영)
+    async def _save_index(self):
+        _, disk_lock = self._locks()
+        async with disk_lock:
+            index = {"entries": {url: dict(entry) for url, entry in self._entries.items()}, "blobs": list(self._blobs)}
+            await asyncio.to_thread(self._write_index, index)
+
+    def _write_index(self, index: dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=INDEX_FILE, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, os.path.join(self.cache_dir, INDEX_FILE))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _touch(self, content_hash: str):
+        self._blobs.move_to_end(content_hash)
+
+    def _pin(self, content_hash: str):
+        self._pins[content_hash] = self._pins.get(content_hash, 0) + 1
+
+    # fetch()로 받은 파일 사용이 끝나면 호출 (고정이 모두 풀린 파일은 다음 정리 때 삭제 대상이 됨)
+    def release(self, path: str):
+        content_hash = os.path.basename(path)[:-len(".pdf")]
+        count = self._pins.get(content_hash, 0) - 1
+        if count > 0:
+            self._pins[content_hash] = count
+        else:
+            self._pins.pop(content_hash, None)
 
-def get_cache_filename(doc_url: str) -> str:
-    file_hash = hashlib.sha256(doc_url.encode()).hexdigest()
-    file_path = os.path.join(CACHE_DIR, f"{file_hash}.pdf")
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    return file_path
+    def total_bytes(self) -> int:
+        return sum(self._blobs.values())
 
-async def download_document(doc_url: str) -> bytes:
-    cache_path = get_cache_filename(doc_url)
+    # 용량 초과 시 LRU 순으로 삭제 (사용 중인 파일과 keep(방금 받은 파일)은 한도보다 커도 유지)
+    async def _evict(self, keep: Optional[str] = None):
+        _, disk_lock = self._locks()
+        async with disk_lock:
+            total = self.total_bytes()
+            evicted = []
+            for content_hash in list(self._blobs):
+                if total <= self.max_bytes:
+                    break
+                if content_hash == keep or content_hash in self._pins:
+                    continue
+                total -= self._blobs.pop(content_hash)
+                evicted.append(content_hash)
+            if not evicted:
+                return
+            self._entries = {url: entry for url, entry in self._entries.items() if entry["hash"] not in evicted}
+            self._stats["evictions"] += len(evicted)
+            await asyncio.to_thread(self._remove_blobs, evicted)
 
-    if os.path.exists(cache_path):
-        with open(cache_path, "rb") as f:
-            return f.read()
+    # 부가 파일(추출 텍스트 등)을 같은 이름으로 저장한 뒤 호출하면 용량 계산에 포함
+    async def refresh_size(self, content_hash: str):
+        if content_hash in self._blobs:
+            size = await asyncio.to_thread(self._blob_size, content_hash)
+            if content_hash in self._blobs:
+                self._blobs[content_hash] = size
+            await self._evict(keep=content_hash)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(doc_url) as resp:
+    def _session_or_create(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=TIMEOUT_SECONDS)
+            )
+        return self._session
+
+    async def fetch(self, doc_url: str) -> str:
+        """URL의 문서를 캐시에 받아 두고 파일 경로를 반환
+
+        반환된 파일은 release(path)를 호출할 때까지 용량 정리에서 삭제되지 않음
+        """
+        await self._ensure_loaded()
+        while True:
+            if doc_url in self._inflight:
+                self._stats["coalesced"] += 1
+                path = await asyncio.shield(self._inflight[doc_url])
+            else:
+                path = await self._fetch_once(doc_url)
+
+            # 결과를 받은 시점에 아직 캐시에 있으면 바로 고정 (함께 기다리는 사이 정리되었으면 다시 받음)
+            content_hash = os.path.basename(path)[:-len(".pdf")]
+            if content_hash in self._blobs:
+                self._pin(content_hash)
+                return path
+
+    async def _fetch_once(self, doc_url: str) -> str:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[doc_url] = future
+        try:
+            path = await self._fetch(doc_url)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # 기다리는 호출이 없어도 "exception never retrieved" 경고가 나지 않도록 함
+            raise
+        else:
+            future.set_result(path)
+            return path
+        finally:
+            self._inflight.pop(doc_url, None)
+
+    async def _fetch(self, doc_url: str) -> str:
+        entry = self._entries.get(doc_url)
+        if entry and not await asyncio.to_thread(os.path.exists, self.blob_path(entry["hash"])):
+            # 캐시 파일이 밖에서 지워졌으면 새로 받음
+            self._blobs.pop(entry["hash"], None)
+            self._entries.pop(doc_url, None)
+            entry = None
+        headers = {}
+        if entry:
+            has_validator = entry.get("etag") or entry.get("last_modified")
+            if not has_validator or time.time() - entry["validated_at"] < FRESH_SECONDS:
+                if entry["hash"] in self._blobs:
+                    self._stats["hits"] += 1
+                    self._touch(entry["hash"])
+                    return self.blob_path(entry["hash"])
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        async with self._session_or_create().get(doc_url, headers=headers) as resp:
+            if resp.status == 304 and entry and entry["hash"] in self._blobs:
+                self._stats["revalidated"] += 1
+                entry["validated_at"] = time.time()
+                self._touch(entry["hash"])
+                await self._save_index()
+                return self.blob_path(entry["hash"])
             if resp.status != 200:
                 raise Exception(f"다운로드 실패: {resp.status}")
-            content = await resp.read()
 
-    with open(cache_path, "wb") as f:
-        f.write(content)
+            self._stats["misses"] += 1
+            content_hash, size = await self._stream_to_disk(resp)
+            self._entries[doc_url] = {
+                "hash": content_hash,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "validated_at": time.time(),
+                "size": size
+            }
+
+        await self._evict(keep=content_hash)
+        await self._save_index()
+        return self.blob_path(content_hash)
+
+    async def _stream_to_disk(self, resp: aiohttp.ClientResponse) -> tuple:
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=self.cache_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                    hasher.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+                    size += len(chunk)
+            content_hash = hasher.hexdigest()
+            # 파일 교체와 등록은 정리(삭제)와 겹치지 않도록 잠금 안에서 수행
+            _, disk_lock = self._locks()
+            async with disk_lock:
+                self._blobs[content_hash] = await asyncio.to_thread(self._commit_blob, tmp_path, content_hash)
+                self._touch(content_hash)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._stats["downloaded_bytes"] += size
+        return content_hash, size
+
+    def _commit_blob(self, tmp_path: str, content_hash: str) -> int:
+        # 다른 URL에서 이미 같은 내용을 받았으면 기존 파일을 그대로 사용
+        if os.path.exists(self.blob_path(content_hash)):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, self.blob_path(content_hash))
+        return self._blob_size(content_hash)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def stats(self) -> dict:
+        await self._ensure_loaded()
+        lookups = self._stats["hits"] + self._stats["revalidated"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "urls": len(self._entries),
+            "files": len(self._blobs),
+            "bytes": self.total_bytes(),
+            "max_bytes": self.max_bytes,
+            "inflight": len(self._inflight),
+            "pinned": len(self._pins),
+            "hit_rate": round((self._stats["hits"] + self._stats["revalidated"]) / lookups, 3) if lookups else 0.0
+        }
+
+
+download_manager = DownloadManager.getInstance()
+
+
+# 반환된 파일은 사용이 끝나면 release_cached_document()로 고정을 풀어야 함 (가능하면 cached_document() 사용)
+async def download_to_cache(doc_url: str) -> str:
+    return await download_manager.fetch(doc_url)
+
+
+def release_cached_document(path: str):
+    download_manager.release(path)
+
+
+# async with cached_document(url) as path: 블록 안에서는 캐시 파일이 삭제되지 않음
+@asynccontextmanager
+async def cached_document(doc_url: str) -> AsyncIterator[str]:
+    path = await download_manager.fetch(doc_url)
+    try:
+        yield path
+    finally:
+        download_manager.release(path)
+
+
+async def close_download_session():
+    await download_manager.close()
+
 
-    return content
\ No newline at end of file
+async def download_cache_stats() -> dict:
+    return await download_manager.stats()
@@ -0,0 +1,332 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+# 모델별 추론 워커 프로세스 수 (0이면 워커 없이 현재 프로세스의 스레드에서 추론)
+INFERENCE_WORKERS = int(os.getenv("DOCUMENTS_MULTI_AGENTS_INFERENCE_WORKERS", "0"))
+# 마이크로 배치: 첫 요청 후 최대 대기 시간과 한 배치의 최대 입력 수
+INFERENCE_MAX_WAIT_MS = float(os.getenv("DOCUMENTS_MULTI_AGENTS_INFERENCE_MAX_WAIT_MS", "20"))
+INFERENCE_MAX_BATCH = int(os.getenv("DOCUMENTS_MULTI_AGENTS_INFERENCE_MAX_BATCH", "16"))
+# 모델이 한 번의 forward에 처리할 입력 수 (배치 안에서 길이순으로 나눠 처리)
+INFERENCE_BATCH_SIZE = int(os.getenv("DOCUMENTS_MULTI_AGENTS_SUMMARIZE_BATCH_SIZE", "8"))
+# 워커당 torch intra-op 스레드 수 (기본: 코어를 전체 워커 수로 나눔)
+INFERENCE_THREADS = int(os.getenv("DOCUMENTS_MULTI_AGENTS_INFERENCE_THREADS", "0"))
+
+
+def run_sorted_batch(pipe, inputs: List[str], batch_size: int, **kwargs) -> List[dict]:
+    """토큰 길이순으로 정렬해 비슷한 길이끼리 배치로 묶어 패딩을 줄이고, 결과는 입력 순서로 복원"""
+    lengths = [len(ids) for ids in pipe.tokenizer(inputs, truncation=True)["input_ids"]]
+    order = sorted(range(len(inputs)), key=lambda i: lengths[i])
+    outputs = pipe([inputs[i] for i in order], batch_size=max(1, batch_size), **kwargs)
+    results: List[Any] = [None] * len(inputs)
+    for i, output in zip(order, outputs):
+        results[i] = output[0] if isinstance(output, list) else output
+    return results
+
+
+# 워커 프로세스: 모델 하나를 소유하고 파이프로 받은 배치를 처리
+def _inference_worker_main(name: str, conn, threads: int):
+    from documents_multi_agents.infrastructure.external.model_registry import ModelRegistry
+
+    registry = ModelRegistry.getInstance()
+    registry.set_threads(threads)
+    try:
+        pipe = registry.get(name)
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {str(e)}"))
+        return
+    conn.send(("ready", registry.stats()["models"][name]))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message is None:
+            break
+        inputs, kwargs, batch_size = message
+        try:
+            conn.send(("ok", run_sorted_batch(pipe, inputs, batch_size, **kwargs)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {str(e)}"))
+
+
+class _Pending:
+    __slots__ = ("input", "kwargs", "key", "future", "queued_at")
+
+    def __init__(self, input: str, kwargs: dict, future: asyncio.Future):
+        self.input = input
+        self.kwargs = kwargs
+        self.key = tuple(sorted(kwargs.items()))  # 생성 인자가 같은 요청끼리만 한 배치로 묶음
+        self.future = future
+        self.queued_at = time.perf_counter()
+
+
+class _Worker:
+    def __init__(self, name: str, threads: int):
+        self.name = name
+        self.threads = threads
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn = None
+        self.info: dict = {}
+
+    def start(self):
+        # torch는 fork 이후 스레드 풀이 멈출 수 있으므로 spawn으로 깨끗한 프로세스에서 모델을 로드
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_inference_worker_main, args=(self.name, child_conn, self.threads), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+        try:
+            status, payload = self.conn.recv()
+        except EOFError:
+            status, payload = "error", f"exit code {self.process.exitcode}"
+        if status != "ready":
+            self.stop()
+            raise RuntimeError(f"Inference worker for {self.name} failed to start: {payload}")
+        self.info = payload
+
+    def call(self, inputs: List[str], kwargs: dict, batch_size: int) -> List[dict]:
+        try:
+            self.conn.send((inputs, kwargs, batch_size))
+            status, payload = self.conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            # 워커가 죽었으면 다시 띄우고 이번 배치는 실패 처리
+            self.stop()
+            self.start()
+            raise RuntimeError(f"Inference worker for {self.name} exited; restarted")
+        if status != "ok":
+            raise RuntimeError(payload)
+        return payload
+
+    def stop(self):
+        if self.conn is not None:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+
+
+class _ModelPool:
+    """모델 하나에 대한 워커 풀 + 마이크로 배처
+
+    진행 중인 모든 요청의 입력을 한 대기열에 모으고, 유휴 워커가 생기면 첫 입력 이후 max_wait 동안
+    같은 생성 인자의 입력을 최대 max_batch개까지 모아 한 번에 워커로 보낸다.
+    """
+
+    def __init__(self, name: str, workers: int, threads: int, max_batch: int, max_wait_ms: float, batch_size: int):
+        self.name = name
+        self.workers = [_Worker(name, threads) for _ in range(max(1, workers))]
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.batch_size = batch_size
+        self._pending: Deque[_Pending] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()  # 실행 중인 배치 태스크 (참조를 유지해 GC로 사라지지 않도록)
+        self._stats = {"batches": 0, "items": 0, "max_batch_seen": 0, "errors": 0, "queue_wait_ms": 0.0, "inference_ms": 0.0}
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        # 모든 워커의 기동이 끝날 때까지 기다린 뒤, 하나라도 실패하면 이미 뜬 워커를 정리하고 첫 오류를 전달
+        results = await asyncio.gather(
+            *(loop.run_in_executor(None, worker.start) for worker in self.workers), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await asyncio.gather(*(loop.run_in_executor(None, worker.stop) for worker in self.workers))
+            raise errors[0]
+        for worker in self.workers:
+            self._idle.put_nowait(worker)
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    def stop(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        for worker in self.workers:
+            worker.stop()
+
+    def submit(self, inputs: List[str], kwargs: dict) -> List[asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in inputs:
+            future = loop.create_future()
+            self._pending.append(_Pending(text, kwargs, future))
+            futures.append(future)
+        self._wakeup.set()
+        return futures
+
+    def _matching(self) -> int:
+        key = self._pending[0].key
+        return sum(1 for p in self._pending if p.key == key)
+
+    def _take_batch(self) -> List[_Pending]:
+        key = self._pending[0].key
+        batch, rest = [], deque()
+        while self._pending:
+            item = self._pending.popleft()
+            if item.future.done():  # 기다리던 요청이 취소됨
+                continue
+            if item.key == key and len(batch) < self.max_batch:
+                batch.append(item)
+            else:
+                rest.append(item)
+        self._pending = rest
+        return batch
+
+    async def _dispatch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            worker = await self._idle.get()
+            while not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            deadline = loop.time() + self.max_wait
+            while self._matching() < self.max_batch and (remaining := deadline - loop.time()) > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = self._take_batch()
+            if not batch:
+                self._idle.put_nowait(worker)
+                continue
+            task = asyncio.create_task(self._run(worker, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, worker: _Worker, batch: List[_Pending]):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self._stats["batches"] += 1
+        self._stats["items"] += len(batch)
+        self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(batch))
+        self._stats["queue_wait_ms"] += sum(started - p.queued_at for p in batch) * 1000
+        try:
+            outputs = await loop.run_in_executor(
+                None, worker.call, [p.input for p in batch], batch[0].kwargs, self.batch_size
+            )
+        except Exception as e:
+            self._stats["errors"] += 1
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(e)
+        else:
+            for p, output in zip(batch, outputs):
+                if not p.future.done():
+                    p.future.set_result(output)
+        finally:
+            self._stats["inference_ms"] += (time.perf_counter() - started) * 1000
+            self._idle.put_nowait(worker)
+
+    def stats(self) -> dict:
+        batches = self._stats["batches"]
+        return {
+            "workers": len(self.workers),
+            "queued": len(self._pending),
+            "batches": batches,
+            "items": self._stats["items"],
+            "avg_batch": round(self._stats["items"] / batches, 2) if batches else 0.0,
+            "max_batch_seen": self._stats["max_batch_seen"],
+            "errors": self._stats["errors"],
+            "avg_queue_wait_ms": round(self._stats["queue_wait_ms"] / max(1, self._stats["items"]), 1),
+            "avg_batch_ms": round(self._stats["inference_ms"] / batches, 1) if batches else 0.0,
+            "worker_models": [worker.info for worker in self.workers]
+        }
+
+
+class InferenceServer:
+    """로컬 모델 추론 서버 (모델별 워커 프로세스 풀 + 요청 간 마이크로 배칭)
+
+    요청을 처리하는 프로세스에서는 GIL/torch 스레드를 점유하지 않고, 추론은 모델을 소유한
+    워커 프로세스들이 파이프로 받은 배치 단위로 수행한다. 워커 수가 0이면 비활성화.
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.workers_per_model = INFERENCE_WORKERS
+            cls.__instance._pools: Dict[str, _ModelPool] = {}
+            cls.__instance._start_lock = None
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers_per_model > 0
+
+    def _threads_per_worker(self, models: int) -> int:
+        if INFERENCE_THREADS > 0:
+            return INFERENCE_THREADS
+        return max(1, (os.cpu_count() or 1) // max(1, models * self.workers_per_model))
+
+    async def _get_pool(self, name: str) -> _ModelPool:
+        pool = self._pools.get(name)
+        if pool is not None:
+            return pool
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if name not in self._pools:
+                from documents_multi_agents.infrastructure.external.model_registry import MODEL_SPECS
+
+                pool = _ModelPool(
+                    name, self.workers_per_model, self._threads_per_worker(len(MODEL_SPECS)),
+                    INFERENCE_MAX_BATCH, INFERENCE_MAX_WAIT_MS, INFERENCE_BATCH_SIZE
+                )
+                await pool.start()
+                self._pools[name] = pool
+        return self._pools[name]
+
+    async def warm_up(self, names: List[str]):
+        await asyncio.gather(*(self._get_pool(name) for name in names))
+
+    async def infer(self, name: str, inputs: List[str], **kwargs) -> List[dict]:
+        if not inputs:
+            return []
+        pool = await self._get_pool(name)
+        return list(await asyncio.gather(*pool.submit(inputs, kwargs)))
+
+    def shutdown(self):
+        for pool in self._pools.values():
+            pool.stop()
+        self._pools.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "workers_per_model": self.workers_per_model,
+            "max_batch": INFERENCE_MAX_BATCH,
+            "max_wait_ms": INFERENCE_MAX_WAIT_MS,
+            "pools": {name: pool.stats() for name, pool in self._pools.items()}
+        }
+
+
+def shutdown_inference_server():
+    InferenceServer.getInstance().shutdown()
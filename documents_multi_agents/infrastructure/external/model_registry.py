@@ -0,0 +1,136 @@
+import gc
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+# 모델 이름 -> (transformers pipeline task, 모델 ID)
+MODEL_SPECS: Dict[str, tuple] = {
+    "summarizer": ("summarization", os.getenv("DOCUMENTS_MULTI_AGENTS_SUMMARIZER_MODEL", "facebook/bart-large-cnn")),
+    "qa": ("text2text-generation", os.getenv("DOCUMENTS_MULTI_AGENTS_QA_MODEL", "google/flan-t5-large"))
+}
+MODEL_DEVICE = int(os.getenv("DOCUMENTS_MULTI_AGENTS_DEVICE", "-1"))
+# 추론 백엔드: torch (기본) / onnx (ONNX Runtime int8 동적 양자화, CPU 전용)
+MODEL_BACKEND = os.getenv("DOCUMENTS_MULTI_AGENTS_BACKEND", "torch").lower()
+MODEL_BACKENDS = ("torch", "onnx")
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+class ModelRegistry:
+    """transformers 파이프라인 레지스트리
+
+    - 모듈 import 시점이 아니라 처음 사용할 때 모델을 로드 (같은 모델은 프로세스당 한 번만 로드)
+    - warm_up()으로 기동 시 미리 로드할 수 있고, 워커를 fork하기 전에 부모 프로세스에서 로드한 뒤
+      prepare_for_fork()를 호출하면 가중치 메모리를 워커들이 copy-on-write로 공유함
+    - 모델별 로드 시간, 파라미터 크기, 로드 전후 RSS 증가량을 기록
+    - backend가 onnx이면 ONNX Runtime int8 모델로 같은 인터페이스의 파이프라인을 만듦
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.specs = dict(MODEL_SPECS)
+            cls.__instance.device = MODEL_DEVICE
+            cls.__instance.backend = MODEL_BACKEND
+            cls.__instance.intra_op_threads = None  # 추론 워커 프로세스가 코어 몫에 맞춰 지정
+            cls.__instance._models = {}
+            cls.__instance._stats = {}
+            cls.__instance._locks = {name: threading.Lock() for name in MODEL_SPECS}
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    # 여러 스레드(asyncio.to_thread)가 동시에 처음 호출해도 모델별 잠금으로 한 번만 로드
+    def get(self, name: str) -> Any:
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        if name not in self.specs:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._locks[name]:
+            if name not in self._models:
+                self._models[name] = self._load(name)
+        return self._models[name]
+
+    def _load(self, name: str) -> Any:
+        if self.backend not in MODEL_BACKENDS:
+            raise ValueError(f"Unknown model backend: {self.backend} (expected one of {MODEL_BACKENDS})")
+
+        task, model_id = self.specs[name]
+        rss_before = current_rss()
+        started = time.perf_counter()
+        if self.backend == "onnx":
+            from documents_multi_agents.infrastructure.external.onnx_backend import load_onnx_pipeline
+
+            model, param_bytes = load_onnx_pipeline(task, model_id, self.intra_op_threads)
+        else:
+            # transformers/torch import 자체도 수 초가 걸리므로 실제 로드 시점에 import
+            from transformers import pipeline
+
+            model = pipeline(task, model=model_id, device=self.device)
+            model.model.eval()
+            param_bytes = sum(p.numel() * p.element_size() for p in model.model.parameters())
+        load_seconds = time.perf_counter() - started
+
+        self._stats[name] = {
+            "task": task,
+            "model": model_id,
+            "backend": self.backend,
+            "load_seconds": round(load_seconds, 2),
+            "param_mb": round(param_bytes / 2 ** 20, 1),
+            "rss_delta_mb": round(max(0, current_rss() - rss_before) / 2 ** 20, 1),
+            "loaded_at": time.time(),
+            "pid": os.getpid()
+        }
+        print(f"[MODEL] loaded {name} ({model_id}, {self.backend}) in {load_seconds:.1f}s, params {self._stats[name]['param_mb']} MB")
+        return model
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> dict:
+        for name in names or self.specs:
+            self.get(name)
+        return self.stats()
+
+    # torch 스레드 수 지정 (onnx 백엔드는 로드할 때 intra_op_threads를 세션 옵션으로 사용)
+    def set_threads(self, threads: int):
+        self.intra_op_threads = max(1, threads)
+        try:
+            import torch
+        except ImportError:
+            return
+        torch.set_num_threads(self.intra_op_threads)
+
+    # fork 직전 호출: 로드된 객체들을 GC 추적 대상에서 빼서 자식 프로세스의 GC가 공유 페이지를 건드리지 않도록 함
+    @staticmethod
+    def prepare_for_fork():
+        gc.collect()
+        gc.freeze()
+
+    def stats(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "rss_mb": round(current_rss() / 2 ** 20, 1),
+            "backend": self.backend,
+            "models": {
+                name: {"loaded": name in self._models, **self._stats.get(name, {"task": task, "model": model_id})}
+                for name, (task, model_id) in self.specs.items()
+            }
+        }
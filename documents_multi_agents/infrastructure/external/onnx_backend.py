@@ -0,0 +1,140 @@
+"""transformers 파이프라인의 ONNX Runtime int8 백엔드
+
+seq2seq 모델(BART, flan-t5)을 optimum으로 ONNX로 내보내고 인코더/디코더 각각에 동적 int8 양자화를 적용한 뒤,
+onnxruntime(CPUExecutionProvider)으로 실행하는 transformers 파이프라인을 만든다.
+내보낸 모델은 ONNX_MODEL_DIR 아래에 모델 ID별로 저장되어 다음 기동부터는 변환 없이 바로 로드된다.
+
+    python -m documents_multi_agents.infrastructure.external.onnx_backend --models summarizer,qa
+"""
+import argparse
+import os
+import platform
+import shutil
+import tempfile
+import time
+from typing import Optional, Tuple
+
+ONNX_MODEL_DIR = os.getenv("DOCUMENTS_MULTI_AGENTS_ONNX_DIR", "./models/onnx")
+# 양자화 설정 (auto: CPU 명령어 집합에 맞춰 선택, avx2 / avx512 / avx512_vnni / arm64 지정 가능)
+ONNX_QUANTIZATION = os.getenv("DOCUMENTS_MULTI_AGENTS_ONNX_QUANTIZATION", "auto")
+
+# 변환이 끝까지 완료된 디렉토리에만 남기는 표시 파일 (중간에 실패한 디렉토리는 다시 변환)
+EXPORT_MARKER = "export_complete"
+
+
+def quantized_model_dir(model_id: str) -> str:
+    return os.path.join(ONNX_MODEL_DIR, model_id.replace("/", "--") + "-int8")
+
+
+def _cpu_flags() -> set:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+
+def _quantization_config():
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    target = ONNX_QUANTIZATION
+    if target == "auto":
+        flags = _cpu_flags()
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            target = "arm64"
+        elif "avx512_vnni" in flags:
+            target = "avx512_vnni"
+        elif "avx512f" in flags:
+            target = "avx512"
+        else:
+            target = "avx2"
+    # 동적 양자화: 가중치만 int8로 저장하고 활성값은 실행 시점에 양자화 (보정 데이터 불필요)
+    return target, getattr(AutoQuantizationConfig, target)(is_static=False, per_channel=False)
+
+
+def export_quantized(model_id: str, output_dir: Optional[str] = None) -> str:
+    """모델을 ONNX로 내보내고 int8 동적 양자화를 적용한 디렉토리 경로 반환 (이미 있으면 재사용)"""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from transformers import AutoTokenizer
+
+    output_dir = output_dir or quantized_model_dir(model_id)
+    if os.path.exists(os.path.join(output_dir, EXPORT_MARKER)):
+        return output_dir
+
+    started = time.perf_counter()
+    target, config = _quantization_config()
+    os.makedirs(os.path.dirname(os.path.abspath(output_dir)), exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_dir))) as workdir:
+        fp32_dir = os.path.join(workdir, "fp32")
+        int8_dir = os.path.join(workdir, "int8")
+        ORTModelForSeq2SeqLM.from_pretrained(model_id, export=True).save_pretrained(fp32_dir)
+        AutoTokenizer.from_pretrained(model_id).save_pretrained(fp32_dir)
+
+        os.makedirs(int8_dir)
+        for file_name in sorted(os.listdir(fp32_dir)):
+            if file_name.endswith(".onnx"):
+                # 양자화 결과(<이름>_quantized.onnx)를 원래 파일 이름으로 저장해 로드 시 기본 파일 이름을 그대로 사용
+                quantizer = ORTQuantizer.from_pretrained(fp32_dir, file_name=file_name)
+                quantizer.quantize(save_dir=os.path.join(workdir, "quantized"), quantization_config=config)
+                shutil.move(
+                    os.path.join(workdir, "quantized", file_name[:-len(".onnx")] + "_quantized.onnx"),
+                    os.path.join(int8_dir, file_name)
+                )
+            elif not file_name.endswith(".onnx_data"):
+                # config / generation_config / 토크나이저 파일 복사 (fp32 가중치 외부 데이터는 제외)
+                shutil.copy(os.path.join(fp32_dir, file_name), os.path.join(int8_dir, file_name))
+
+        open(os.path.join(int8_dir, EXPORT_MARKER), "w").close()
+        if os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+        shutil.move(int8_dir, output_dir)
+
+    print(f"[MODEL] exported {model_id} to ONNX int8 ({target}) in {time.perf_counter() - started:.1f}s: {output_dir}")
+    return output_dir
+
+
+def onnx_model_bytes(model_dir: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(model_dir, name))
+        for name in os.listdir(model_dir) if name.endswith((".onnx", ".onnx_data"))
+    )
+
+
+def load_onnx_pipeline(task: str, model_id: str, threads: Optional[int] = None) -> Tuple[object, int]:
+    """양자화된 ONNX 모델로 transformers 파이프라인을 만들어 (파이프라인, 모델 파일 크기) 반환"""
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+
+    model_dir = export_quantized(model_id)
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        session_options.intra_op_num_threads = threads
+
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_dir, provider="CPUExecutionProvider", session_options=session_options
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return pipeline(task, model=model, tokenizer=tokenizer), onnx_model_bytes(model_dir)
+
+
+# 배포 전에 미리 변환해두면 첫 요청에서 변환 시간(수 분)이 들지 않음
+def main():
+    from documents_multi_agents.infrastructure.external.model_registry import MODEL_SPECS
+
+    parser = argparse.ArgumentParser(description="Export the multi-agent models to quantized ONNX")
+    parser.add_argument("--models", default=",".join(MODEL_SPECS), help=f"comma separated: {tuple(MODEL_SPECS)}")
+    args = parser.parse_args()
+
+    for name in args.models.split(","):
+        _, model_id = MODEL_SPECS[name.strip()]
+        export_quantized(model_id)
+
+
+if __name__ == "__main__":
+    main()
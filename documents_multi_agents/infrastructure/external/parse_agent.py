@@ -1,14 +1,73 @@
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+from typing import Optional
+
 from PyPDF2 import PdfReader
 
-def parse_document(content: bytes, cache_path: str) -> str:
-    with open(cache_path, "wb") as f:
-        f.write(content)
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+from documents_multi_agents.infrastructure.external.download_agent import download_manager
+
+SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+# 페이지를 하나씩 읽어 이어 붙임 (PyMuPDF 우선, 실패 시 PyPDF2)
+def extract_text(pdf_path: str) -> str:
+    if fitz is not None:
+        try:
+            with fitz.open(pdf_path) as doc:
+                return "\n".join(page.get_text("text") or "" for page in doc).strip()
+        except Exception:
+            pass
+    return "\n".join(page.extract_text() or "" for page in PdfReader(pdf_path).pages).strip()  # None 방지
+
+
+def content_hash_of(pdf_path: str) -> str:
+    # 다운로드 캐시 파일은 이름이 곧 내용 해시이므로 다시 읽지 않음
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    if SHA256_HEX.match(stem):
+        return stem
+    hasher = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def parsed_text_path(pdf_path: str, content_hash: Optional[str] = None) -> str:
+    return os.path.join(os.path.dirname(pdf_path), f"{content_hash or content_hash_of(pdf_path)}.txt")
+
+
+def parse_document(pdf_path: str) -> str:
+    """캐시된 PDF 파일에서 텍스트 추출
+
+    추출한 텍스트는 PDF 옆에 <내용 해시>.txt로 저장하여 같은 문서를 다시 분석할 때는 파싱하지 않음
+    """
+    content_hash = content_hash_of(pdf_path)
+    text_path = parsed_text_path(pdf_path, content_hash)
+    try:
+        with open(text_path, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    text = extract_text(pdf_path)
 
-    reader = PdfReader(cache_path)
-    text = ""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(text_path) or ".", suffix=".part")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, text_path)
+    return text
 
-    for page in reader.pages:
-        page_text = page.extract_text() or ""  # None 방지
-        text += page_text + "\n"
 
-    return text.strip()
+# 파싱은 스레드에서 수행하고, 저장된 추출 텍스트를 다운로드 캐시 용량에 포함 (PDF가 LRU로 지워질 때 함께 삭제됨)
+async def parse_cached_document(pdf_path: str) -> str:
+    text = await asyncio.to_thread(parse_document, pdf_path)
+    await download_manager.refresh_size(content_hash_of(pdf_path))
+    return text
@@ -1,7 +1,12 @@
 import asyncio
+import hashlib
+import os
 import re
+from typing import List
 
-from transformers import pipeline
+from documents_multi_agents.infrastructure.cache.async_memo_cache import AsyncMemoCache
+from documents_multi_agents.infrastructure.external.inference_server import InferenceServer, run_sorted_batch
+from documents_multi_agents.infrastructure.external.model_registry import ModelRegistry
 
 def deduplicate_sentences(text: str) -> str:
     sentences = re.split(r'(?<=[.!?])\s+', text)
@@ -53,30 +58,76 @@ def chunk_text(text: str, max_chars: int = 1000):
 
     return chunks
 
-# 모델 로드
-summarizer = pipeline("summarization", model="facebook/bart-large-cnn", device=-1)
-qa_model = pipeline("text2text-generation", model="google/flan-t5-large", device=-1)
+# 모델은 레지스트리에서 처음 사용할 때 로드 (import 시점에 로드하지 않음)
+registry = ModelRegistry.getInstance()
+inference_server = InferenceServer.getInstance()
+
+# 청크 요약을 한 번에 모델에 넘길 배치 크기
+SUMMARIZE_BATCH_SIZE = int(os.getenv("DOCUMENTS_MULTI_AGENTS_SUMMARIZE_BATCH_SIZE", "8"))
+
+# 요약 결과 메모이제이션: (텍스트 해시, max_len, min_len, 모델, 백엔드) 기준
+# bullet/casual처럼 같은 인자의 요약은 한 번만 계산하고, 동시에 들어온 같은 요청은 진행 중인 계산을 공유
+chunk_summary_memo = AsyncMemoCache(int(os.getenv("DOCUMENTS_MULTI_AGENTS_CHUNK_SUMMARY_CACHE_ENTRIES", "2048")))
+document_summary_memo = AsyncMemoCache(int(os.getenv("DOCUMENTS_MULTI_AGENTS_SUMMARY_CACHE_ENTRIES", "256")))
+
+
+def summary_key(text: str, max_len: int, min_len: int) -> tuple:
+    return hashlib.sha256(text.encode()).hexdigest(), max_len, min_len, registry.specs["summarizer"][1], registry.backend
+
+
+def summary_cache_stats() -> dict:
+    return {"chunk": chunk_summary_memo.stats(), "document": document_summary_memo.stats()}
+
+# 모델 호출: 추론 서버가 켜져 있으면 워커 프로세스 풀로 보내 다른 요청의 입력과 함께 마이크로 배치로 처리하고,
+# 꺼져 있으면 현재 프로세스의 스레드에서 실행 (첫 호출의 모델 로드도 스레드에서 수행되어 이벤트 루프를 막지 않음)
+async def run_model(name: str, inputs: List[str], batch_size: int = SUMMARIZE_BATCH_SIZE, **kwargs) -> List[dict]:
+    if inference_server.enabled:
+        return await inference_server.infer(name, inputs, **kwargs)
+    return await asyncio.to_thread(lambda: run_sorted_batch(registry.get(name), inputs, batch_size, **kwargs))
 
-# 안전한 모델 호출
 async def run_summarize(text: str, max_len: int, min_len: int):
-    return await asyncio.to_thread(
-        lambda: summarizer(text, max_length=max_len, min_length=min_len, truncation=True)[0]["summary_text"]
+    async def summarize_one() -> str:
+        return (await run_summarize_texts([text], max_len, min_len, 1))[0]
+
+    return await chunk_summary_memo.get_or_compute(summary_key(text, max_len, min_len), summarize_one)
+
+async def run_summarize_texts(texts: List[str], max_len: int, min_len: int, batch_size: int) -> List[str]:
+    outputs = await run_model(
+        "summarizer", texts, batch_size, max_length=max_len, min_length=min_len, truncation=True
     )
+    return [output["summary_text"] for output in outputs]
 
-async def run_qa(prompt: str):
-    return await asyncio.to_thread(
-        lambda: qa_model(prompt, max_new_tokens=150)[0]["generated_text"]
+# 배치 요약: 토큰 길이순으로 정렬해 비슷한 길이끼리 한 배치로 묶어 패딩을 줄이고, 결과는 입력 순서로 복원
+# 이미 요약했거나 요약 중인 청크는 제외하고 나머지만 배치로 모델에 넘김
+async def run_summarize_batch(texts: List[str], max_len: int, min_len: int, batch_size: int = SUMMARIZE_BATCH_SIZE) -> List[str]:
+    if not texts:
+        return []
+
+    async def summarize_missing(indices: List[int]) -> List[str]:
+        return await run_summarize_texts([texts[i] for i in indices], max_len, min_len, batch_size)
+
+    return await chunk_summary_memo.get_or_compute_many(
+        [summary_key(text, max_len, min_len) for text in texts], summarize_missing
     )
 
-# 계층 요약
+async def run_qa(prompt: str):
+    outputs = await run_model("qa", [prompt], 1, max_new_tokens=150)
+    return outputs[0]["generated_text"]
+
+# 계층 요약 (같은 인자의 요약은 메모이제이션된 결과를 재사용)
 async def safe_summarizer(text: str, max_len: int, min_len: int):
+    return await document_summary_memo.get_or_compute(
+        summary_key(text, max_len, min_len), lambda: _hierarchical_summarize(text, max_len, min_len)
+    )
+
+async def _hierarchical_summarize(text: str, max_len: int, min_len: int):
     chunks = chunk_text(text, 1000)
-    lvl1 = [await run_summarize(c, max_len, min_len) for c in chunks]
+    lvl1 = await run_summarize_batch(chunks, max_len, min_len)
     combined = " ".join(lvl1)
     # 길면 2단계 요약
     if len(combined) > 2000:
         lvl2_chunks = chunk_text(combined, 1000)
-        lvl2 = [await run_summarize(c, max_len, min_len) for c in lvl2_chunks]
+        lvl2 = await run_summarize_batch(lvl2_chunks, max_len, min_len)
         combined = " ".join(lvl2)
     return deduplicate_sentences(combined)
 
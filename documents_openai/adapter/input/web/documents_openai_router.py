@@ -1,155 +1,275 @@
-from fastapi import APIRouter, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
-from openai import OpenAI
-from pypdf import PdfReader
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 import asyncio
-import io
-import re
-from typing import List
+import json
+from typing import List, Optional
+
+from documents_openai.application.usecase.analysis_job_usecase import AnalysisJobUseCase
+from documents_openai.application.usecase.batch_analysis_usecase import BatchAnalysisUseCase, BATCH_MAX_FILES, \
+    BATCH_MAX_QUESTIONS
+from documents_openai.application.usecase.document_analysis_usecase import DocumentAnalysisUseCase, QA_MODES
+from documents_openai.infrastructure.external.chunk_index import is_document_hash
+from documents_openai.infrastructure.external.openai_agents import RETRIEVAL_TOP_K
+from documents_openai.infrastructure.external.upload_spool import SpooledUpload, spool_upload
 
 documents_openai_router = APIRouter(tags=["documents_multi_agents"])
 
-client = OpenAI()
+usecase = DocumentAnalysisUseCase.getInstance()
+job_usecase = AnalysisJobUseCase.getInstance()
+batch_usecase = BatchAnalysisUseCase.getInstance()
+
+
+@documents_openai_router.post("/analyze")
+async def analyze_document(file: UploadFile, question: str = Form(...), qa_mode: str = Form("summary")):
+    if qa_mode not in QA_MODES:
+        raise HTTPException(400, f"qa_mode must be one of {QA_MODES}")
 
-# PDF 텍스트 추출
-def extract_text_from_pdf_clean(file_bytes: bytes) -> str:
+    upload = None
     try:
-        reader = PdfReader(io.BytesIO(file_bytes))
-        texts = []
-        for page in reader.pages:
-            t = page.extract_text() or ""
-            t = re.sub(r'\s+', ' ', t)                # 공백 정리
-            t = re.sub(r'\d+\s*$', '', t)            # 페이지 번호 제거
-            if t.strip():
-                texts.append(t.strip())
-        return "\n".join(texts)
+        # 업로드를 메모리에 올리지 않고 임시 파일로 스트리밍 (해시도 함께 계산)
+        upload = await spool_upload(file)
+        if upload.size == 0:
+            raise HTTPException(400, "Empty file upload")
+
+        # 같은 파일은 내용 해시로 식별하여 이전 결과를 재사용
+        result = await usecase.analyze_document(upload.sha256, upload.path, question, qa_mode=qa_mode)
+        return JSONResponse(result)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # 추출 실패(PDF 파싱 오류, 텍스트 없음)는 스트리밍 엔드포인트와 같이 400
+        raise HTTPException(400, str(e))
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"PDF parsing error: {str(e)}")
-
-# 텍스트 청킹
-def chunk_text(text: str, chunk_size=3500, overlap=300) -> List[str]:
-    paragraphs = [p.strip() for p in text.split("\n") if p.strip()]
-    chunks, cur = [], ""
-    for p in paragraphs:
-        if len(cur) + len(p) <= chunk_size:
-            cur += " " + p
-        else:
-            chunks.append(cur.strip())
-            cur = p
-    if cur:
-        chunks.append(cur.strip())
-    return chunks
-
-# GPT 호출 래퍼
-async def ask_gpt(prompt: str, max_tokens=500):
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, lambda:
-        client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens,
-            temperature=0
-        ).choices[0].message.content
-    )
+        raise HTTPException(500, f"{type(e).__name__}: {str(e)}")
+    finally:
+        if upload is not None:
+            upload.cleanup()
 
-# 문서 요약 에이전트 (섹션 요약 후 전체 요약)
-async def summarize_document(chunks: List[str]) -> str:
-    partial_summaries = []
-
-    for idx, chunk in enumerate(chunks):
-        prompt = f"""
-다음은 문서의 일부이다. 이 문단을 핵심 내용만 유지하며 간결하게 요약해라.
-
-문단({idx+1}):
-{chunk}
-"""
-        summary = await ask_gpt(prompt, max_tokens=400)
-        partial_summaries.append(summary)
-
-    merged = "\n".join(partial_summaries)
-
-    # 전체 요약
-    final_prompt = f"""
-다음은 여러 요약문을 결합한 것이다. 이 내용을 다시 한 번 전체 핵심만 유지하며 통합 요약해라.
-
-내용:
-{merged}
-
-출력 형식:
-- 전체 요약 1개 문단
-"""
-    final_summary = await ask_gpt(final_prompt, max_tokens=500)
-    return final_summary.strip()
-
-# QA 에이전트
-async def qa_on_document(summary: str, question: str) -> str:
-    prompt = f"""
-다음은 문서 요약이다. 이 요약 내의 정보만 사용하여 질문에 답해라.
-
-요약:
-{summary}
-
-질문:
-{question}
-
-규칙:
-- 추론하지 말고 요약 내에서만 답을 찾아라.
-- 없으면 "문서에 해당 정보 없음"이라고 답해라.
-"""
-    return (await ask_gpt(prompt, max_tokens=300)).strip()
-
-# 감성 분석 + 키포인트 에이전트
-async def analyze_opinions(summary: str) -> dict:
-    prompt = f"""
-다음 문서 요약에 대해 감성 분석과 핵심 포인트 추출을 수행해라.
-
-요약:
-{summary}
-
-출력 형식(JSON):
-{{
-    "sentiment": "positive | negative | neutral",
-    "key_points": ["핵심 문장1", "핵심 문장2", ... 5개]
-}}
-"""
-    raw = await ask_gpt(prompt, max_tokens=300)
-
-    import json
-    try:
-        return json.loads(raw)
-    except:
-        return {"sentiment": "unknown", "key_points": []}
 
-@documents_openai_router.post("/analyze")
-async def analyze_document(file: UploadFile, question: str = Form(...)):
+# 여러 문서 + 질문 세트 일괄 분석: 문서별 결과와 질문별 문서 간 통합 답변 반환
+@documents_openai_router.post("/analyze/batch")
+async def analyze_documents_batch(
+    files: List[UploadFile] = File(...),
+    questions: List[str] = Form(...),
+    qa_mode: str = Form("summary")
+):
+    if qa_mode not in QA_MODES:
+        raise HTTPException(400, f"qa_mode must be one of {QA_MODES}")
+    questions = [q for q in questions if q.strip()]
+    if not questions or len(questions) > BATCH_MAX_QUESTIONS:
+        raise HTTPException(400, f"1 to {BATCH_MAX_QUESTIONS} questions are required")
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(400, f"At most {BATCH_MAX_FILES} files per batch")
+
+    uploads = []
     try:
-        content = await file.read()
-        if not content:
-            raise HTTPException(400, "Empty file upload")
+        for file in files:
+            upload = await spool_upload(file)
+            uploads.append((file.filename, upload))
+            if upload.size == 0:
+                raise HTTPException(400, f"Empty file upload: {file.filename}")
 
-        text = extract_text_from_pdf_clean(content)
-        if not text:
-            raise HTTPException(400, "No text extracted")
+        result = await batch_usecase.analyze_batch(uploads, questions, qa_mode=qa_mode)
+        return JSONResponse(result)
 
-        chunks = chunk_text(text)
-        if not chunks:
-            raise HTTPException(500, "Chunking failed")
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # 추출 실패(PDF 파싱 오류, 텍스트 없음)는 스트리밍 엔드포인트와 같이 400
+        raise HTTPException(400, str(e))
+    except Exception as e:
+        raise HTTPException(500, f"{type(e).__name__}: {str(e)}")
+    finally:
+        for _, upload in uploads:
+            upload.cleanup()
 
-        # 1. 요약
-        summary = await summarize_document(chunks)
 
-        # 2. QA
-        answer = await qa_on_document(summary, question)
+# 검색 기반 QA: 이미 인덱싱된 문서는 document_hash만으로 요약 없이 바로 답변
+@documents_openai_router.post("/qa")
+async def answer_question(
+    question: str = Form(...),
+    file: Optional[UploadFile] = None,
+    document_hash: Optional[str] = Form(None),
+    top_k: int = Form(RETRIEVAL_TOP_K)
+):
+    if file is None and not document_hash:
+        raise HTTPException(400, "file or document_hash is required")
+    if file is None and not is_document_hash(document_hash):
+        raise HTTPException(400, "document_hash must be a lowercase hex SHA-256")
 
-        # 3. 감성 분석 + 키포인트
-        analysis = await analyze_opinions(summary)
+    upload = None
+    try:
+        if file is not None:
+            upload = await spool_upload(file)
+            if upload.size == 0:
+                raise HTTPException(400, "Empty file upload")
+            document_hash = upload.sha256
 
-        return JSONResponse({
-            "parsed_text": text,
-            "summary": summary,
-            "answer": answer,
-            "analysis": analysis
-        })
+        answer = await usecase.answer_question(
+            document_hash, question, path=upload.path if upload else None, top_k=top_k
+        )
+        return JSONResponse({"document_hash": document_hash, "answer": answer})
 
+    except HTTPException:
+        raise
+    except LookupError as e:
+        raise HTTPException(404, str(e))
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     except Exception as e:
         raise HTTPException(500, f"{type(e).__name__}: {str(e)}")
+    finally:
+        if upload is not None:
+            upload.cleanup()
+
+
+# SSE 이벤트 포맷
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# 그래프 단계 이름 -> SSE 이벤트
+STAGE_EVENTS = {
+    "text": ("extracted", "parsed_text"),
+    "summary": ("summary", "summary"),
+    "answer": ("answer", "answer"),
+    "analysis": ("analysis", "analysis")
+}
+
+
+async def stream_analysis(upload: SpooledUpload, question: str, qa_mode: str = "summary"):
+    try:
+        doc_hash = upload.sha256
+
+        # 청크 요약/단계 완료 이벤트를 큐로 받아 완료되는 순서대로 흘려보냄
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def on_partial(idx: int, partial: str):
+            queue.put_nowait(("partial_summary", {"index": idx, "summary": partial}))
+
+        def on_stage_complete(name: str, result):
+            if name not in STAGE_EVENTS:
+                return
+            event, key = STAGE_EVENTS[name]
+            data = {key: result}
+            if name == "text":
+                data["document_hash"] = doc_hash
+            queue.put_nowait((event, data))
+
+        task = asyncio.create_task(usecase.analyze_document(
+            doc_hash, upload.path, question, qa_mode=qa_mode,
+            on_partial=on_partial, on_stage_complete=on_stage_complete
+        ))
+        task.add_done_callback(lambda _: queue.put_nowait(done))
+        try:
+            while (item := await queue.get()) is not done:
+                yield sse_event(*item)
+        finally:
+            # 클라이언트가 연결을 끊으면 남은 작업도 취소
+            if not task.done():
+                task.cancel()
+        result = task.result()
+
+        yield sse_event("done", {"timings": result["timings"], "metrics": result["metrics"]})
+
+    except ValueError as e:
+        yield sse_event("error", {"status_code": 400, "detail": str(e)})
+    except Exception as e:
+        yield sse_event("error", {"status_code": 500, "detail": f"{type(e).__name__}: {str(e)}"})
+    finally:
+        upload.cleanup()
+
+
+@documents_openai_router.post("/analyze/stream")
+async def analyze_document_stream(file: UploadFile, question: str = Form(...), qa_mode: str = Form("summary")):
+    if qa_mode not in QA_MODES:
+        raise HTTPException(400, f"qa_mode must be one of {QA_MODES}")
+
+    upload = await spool_upload(file)
+    if upload.size == 0:
+        upload.cleanup()
+        raise HTTPException(400, "Empty file upload")
+
+    return StreamingResponse(
+        stream_analysis(upload, question, qa_mode),
+        media_type="text/event-stream",
+        background=BackgroundTask(upload.cleanup),  # 스트림 시작 전에 연결이 끊겨도 임시 파일 정리
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # nginx 프록시 버퍼링 비활성화
+        }
+    )
+
+
+# 비동기 작업 모드: 제출 후 즉시 job_id 반환, 분석은 작업 워커 프로세스가 대기열에서 처리
+@documents_openai_router.post("/jobs", status_code=202)
+async def submit_analysis_job(file: UploadFile, question: str = Form(...), qa_mode: str = Form("summary")):
+    if qa_mode not in QA_MODES:
+        raise HTTPException(400, f"qa_mode must be one of {QA_MODES}")
+
+    upload = await spool_upload(file)
+    try:
+        if upload.size == 0:
+            raise HTTPException(400, "Empty file upload")
+        # 파일 이동(다른 파일시스템이면 복사)과 Redis 등록은 스레드에서 수행
+        job = await asyncio.to_thread(job_usecase.submit, upload, question, qa_mode)
+    finally:
+        upload.cleanup()
+
+    return {"job_id": job.job_id, "status": job.status, "document_hash": job.doc_hash}
+
+
+@documents_openai_router.get("/jobs/{job_id}")
+async def get_analysis_job(job_id: str):
+    job = await asyncio.to_thread(job_usecase.get_job, job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "stages": job.stages,
+        "partial_summaries": job.partial_summaries,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at
+    }
+
+
+@documents_openai_router.get("/jobs/{job_id}/result")
+async def get_analysis_job_result(job_id: str):
+    job = await asyncio.to_thread(job_usecase.get_job, job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    if job.status == job.STATUS_FAILED:
+        raise HTTPException(500, job.error)
+    if not job.is_finished():
+        raise HTTPException(409, f"Job is {job.status}")
+
+    return JSONResponse(job.result)
+
+
+# 단계별 지연 시간/토큰 사용량 누적 통계 (프로세스 단위)
+@documents_openai_router.get("/stats/stages")
+async def get_stage_stats():
+    return usecase.stage_stats()
+
+
+@documents_openai_router.get("/cache/stats")
+async def get_cache_stats():
+    return usecase.cache_stats()
+
+
+# 분석 작업 대기열 상태 (대기 중 / 처리 중인 작업 수)
+@documents_openai_router.get("/stats/jobs")
+async def get_job_stats():
+    return await asyncio.to_thread(job_usecase.queue_stats)
+
+
+# 배치 분석 스케줄러 상태 (동시 호출 수, 남은 TPM 토큰, 대기 중인 호출 수)
+@documents_openai_router.get("/stats/scheduler")
+async def get_scheduler_stats():
+    return batch_usecase.scheduler.stats()
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from documents_openai.application.usecase.analysis_job_usecase import AnalysisJobUseCase
+from documents_openai.infrastructure.repository.analysis_job_queue_impl import JOB_LEASE_SECONDS
+
+# 워커 프로세스 하나가 동시에 처리할 작업 수와 대기열 조회 타임아웃
+JOB_CONCURRENCY = int(os.getenv("DOCUMENTS_OPENAI_JOB_CONCURRENCY", "2"))
+JOB_POLL_TIMEOUT = int(os.getenv("DOCUMENTS_OPENAI_JOB_POLL_TIMEOUT", "5"))
+# 점유가 만료된 작업(죽은 워커가 처리하던 작업)을 대기열로 되돌리는 주기
+JOB_RECOVER_INTERVAL = float(os.getenv("DOCUMENTS_OPENAI_JOB_RECOVER_INTERVAL", str(JOB_LEASE_SECONDS)))
+
+
+# 다른 워커 프로세스가 죽어도 그 작업이 처리 중 상태로 남지 않도록 기동 시와 이후 주기적으로 회수
+async def recover_stale_jobs(usecase: AnalysisJobUseCase, interval: float = JOB_RECOVER_INTERVAL):
+    while True:
+        try:
+            recovered = await usecase.recover_stale_jobs()
+            if recovered:
+                print(f"[WORKER] pid={os.getpid()} requeued {recovered} stale jobs")
+        except Exception as e:
+            print(f"[WORKER] pid={os.getpid()} stale job recovery failed: {type(e).__name__}: {str(e)}")
+        await asyncio.sleep(max(1.0, interval))
+
+
+async def run_worker(concurrency: int = JOB_CONCURRENCY):
+    usecase = AnalysisJobUseCase.getInstance()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    running = set()
+
+    print(f"[WORKER] pid={os.getpid()} started (concurrency={concurrency})")
+    recovery = asyncio.create_task(recover_stale_jobs(usecase))
+    while True:
+        # 처리 슬롯이 빌 때까지 대기열에서 가져오지 않아 동시 처리량을 제한
+        await semaphore.acquire()
+        job = await asyncio.to_thread(usecase.job_queue.dequeue, JOB_POLL_TIMEOUT)
+        if job is None:
+            semaphore.release()
+            continue
+
+        print(f"[WORKER] pid={os.getpid()} job={job.job_id} started")
+        task = asyncio.create_task(usecase.run_job(job))
+        running.add(task)
+
+        def on_done(t: asyncio.Task, job_id=job.job_id):
+            running.discard(t)
+            semaphore.release()
+            print(f"[WORKER] pid={os.getpid()} job={job_id} {t.result().status if not t.cancelled() else 'cancelled'}")
+
+        task.add_done_callback(on_done)
+
+
+def _worker_main(concurrency: int):
+    try:
+        asyncio.run(run_worker(concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+# 실행: python -m documents_openai.adapter.input.worker.analysis_worker --processes 2 --concurrency 2
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="documents_openai analysis job worker")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("DOCUMENTS_OPENAI_JOB_PROCESSES", "1")))
+    parser.add_argument("--concurrency", type=int, default=JOB_CONCURRENCY)
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _worker_main(args.concurrency)
+    else:
+        workers = [
+            multiprocessing.Process(target=_worker_main, args=(args.concurrency,), daemon=False)
+            for _ in range(args.processes)
+        ]
+        for w in workers:
+            w.start()
+        try:
+            for w in workers:
+                w.join()
+        except KeyboardInterrupt:
+            for w in workers:
+                w.terminate()
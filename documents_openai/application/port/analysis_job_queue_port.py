@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from documents_openai.domain.analysis_job import AnalysisJob
+
+
+class AnalysisJobQueuePort(ABC):
+
+    @abstractmethod
+    def enqueue(self, job: AnalysisJob) -> AnalysisJob:
+        pass
+
+    @abstractmethod
+    def dequeue(self, timeout: int) -> Optional[AnalysisJob]:
+        pass
+
+    @abstractmethod
+    def save(self, job: AnalysisJob) -> AnalysisJob:
+        pass
+
+    @abstractmethod
+    def renew(self, job: AnalysisJob):
+        pass
+
+    @abstractmethod
+    def acknowledge(self, job: AnalysisJob):
+        pass
+
+    @abstractmethod
+    def recover_stale(self) -> int:
+        pass
+
+    @abstractmethod
+    def find_by_id(self, job_id: str) -> Optional[AnalysisJob]:
+        pass
+
+    @abstractmethod
+    def pending_count(self) -> int:
+        pass
+
+    @abstractmethod
+    def processing_count(self) -> int:
+        pass
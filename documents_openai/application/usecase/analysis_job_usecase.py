@@ -0,0 +1,147 @@
+import asyncio
+import os
+import shutil
+import time
+from typing import Optional
+
+from documents_openai.application.usecase.document_analysis_usecase import DocumentAnalysisUseCase
+from documents_openai.domain.analysis_job import AnalysisJob
+from documents_openai.infrastructure.external.upload_spool import SpooledUpload
+from documents_openai.infrastructure.repository.analysis_job_queue_impl import JOB_LEASE_SECONDS, AnalysisJobQueueImpl
+
+# 웹 워커와 작업 워커가 함께 접근하는 업로드 보관 디렉토리 (같은 호스트/공유 볼륨이어야 함)
+JOB_DIR = os.getenv("DOCUMENTS_OPENAI_JOB_DIR", "./cache/documents_openai/jobs")
+# 진행 상황(부분 요약 수, 단계 완료) 저장 최소 간격 (그 사이의 변경은 모아서 한 번에 저장)
+JOB_PROGRESS_SAVE_INTERVAL = float(os.getenv("DOCUMENTS_OPENAI_JOB_PROGRESS_SAVE_INTERVAL", "0.5"))
+
+
+class _ProgressSaver:
+    """작업 진행 상황을 이벤트 루프 밖(스레드)에서 저장
+
+    콜백마다 Redis에 쓰지 않고, 저장 중이거나 간격이 지나지 않았으면 변경을 모아 다음 저장에 반영
+    """
+
+    def __init__(self, job_queue, job: AnalysisJob, interval: float = JOB_PROGRESS_SAVE_INTERVAL):
+        self.job_queue = job_queue
+        self.job = job
+        self.interval = interval
+        self._dirty = False
+        self._saving = False
+        self._saved_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def mark(self):
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+
+    async def _flush(self):
+        while self._dirty:
+            delay = self.interval - (time.monotonic() - self._saved_at)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._dirty = False
+            self._saving = True
+            try:
+                await asyncio.to_thread(self.job_queue.save, self.job.snapshot())
+            except Exception as e:
+                print(f"[WORKER] job={self.job.job_id} progress save failed: {type(e).__name__}: {str(e)}")
+            finally:
+                self._saving = False
+                self._saved_at = time.monotonic()
+
+    # 최종 상태를 저장하기 전에 호출: 진행 중인 저장은 끝까지 기다리고 (최종 상태를 덮어쓰지 않도록) 대기 중인 저장은 취소
+    async def close(self):
+        self._dirty = False
+        task = self._task
+        if task is None or task.done():
+            return
+        if not self._saving:
+            task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+class AnalysisJobUseCase:
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.job_queue = AnalysisJobQueueImpl.getInstance()
+            cls.__instance.analysis_usecase = DocumentAnalysisUseCase.getInstance()
+            os.makedirs(JOB_DIR, exist_ok=True)
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    # 업로드 파일을 작업 디렉토리로 옮기고 대기열에 등록
+    def submit(self, upload: SpooledUpload, question: str, qa_mode: str = "summary") -> AnalysisJob:
+        job = AnalysisJob.create(doc_hash=upload.sha256, file_path="", question=question, qa_mode=qa_mode)
+        job.file_path = os.path.join(JOB_DIR, f"{job.job_id}.pdf")
+        shutil.move(upload.path, job.file_path)
+        return self.job_queue.enqueue(job)
+
+    def get_job(self, job_id: str) -> Optional[AnalysisJob]:
+        return self.job_queue.find_by_id(job_id)
+
+    def queue_stats(self) -> dict:
+        return {"pending": self.job_queue.pending_count(), "processing": self.job_queue.processing_count()}
+
+    # 작업 워커 기동 시 실행: 죽은 워커가 처리하던 작업을 대기열로 되돌림
+    async def recover_stale_jobs(self) -> int:
+        return await asyncio.to_thread(self.job_queue.recover_stale)
+
+    # 처리하는 동안 점유를 주기적으로 연장 (단계 하나가 오래 걸려도 다른 워커가 가져가지 않도록)
+    async def _keep_lease(self, job: AnalysisJob):
+        while True:
+            await asyncio.sleep(max(1.0, JOB_LEASE_SECONDS / 3))
+            try:
+                await asyncio.to_thread(self.job_queue.renew, job)
+            except Exception as e:
+                print(f"[WORKER] job={job.job_id} lease renewal failed: {type(e).__name__}: {str(e)}")
+
+    # 작업 워커 프로세스에서 실행
+    async def run_job(self, job: AnalysisJob) -> AnalysisJob:
+        job.start()
+        await asyncio.to_thread(self.job_queue.save, job.snapshot())
+        progress = _ProgressSaver(self.job_queue, job)
+        lease = asyncio.create_task(self._keep_lease(job))
+
+        def on_partial(idx: int, partial: str):
+            job.add_partial_summary()
+            progress.mark()
+
+        def on_stage_complete(name: str, result):
+            job.complete_stage(name)
+            progress.mark()
+
+        try:
+            result = await self.analysis_usecase.analyze_document(
+                job.doc_hash, job.file_path, job.question, qa_mode=job.qa_mode,
+                on_partial=on_partial, on_stage_complete=on_stage_complete
+            )
+            job.complete(result)
+        except Exception as e:
+            job.fail(f"{type(e).__name__}: {str(e)}")
+        finally:
+            lease.cancel()
+            await progress.close()
+            await asyncio.to_thread(self._finish, job)
+
+        return job
+
+    def _finish(self, job: AnalysisJob):
+        self.job_queue.save(job)
+        self.job_queue.acknowledge(job)
+        try:
+            os.remove(job.file_path)
+        except FileNotFoundError:
+            pass
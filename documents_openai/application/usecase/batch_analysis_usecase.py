@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Tuple
+
+from documents_openai.application.usecase.document_analysis_usecase import DocumentAnalysisUseCase
+from documents_openai.application.usecase.stage_graph import StageGraph
+from documents_openai.infrastructure.external.llm_scheduler import LLMScheduler, scheduled_document
+from documents_openai.infrastructure.external.openai_agents import consolidate_answers, qa_on_chunks
+from documents_openai.infrastructure.external.pdf_extractor import join_pages
+from documents_openai.infrastructure.external.stage_metrics import collect_request_metrics
+from documents_openai.infrastructure.external.upload_spool import SpooledUpload
+
+BATCH_MAX_FILES = int(os.getenv("DOCUMENTS_OPENAI_BATCH_MAX_FILES", "50"))
+BATCH_MAX_QUESTIONS = int(os.getenv("DOCUMENTS_OPENAI_BATCH_MAX_QUESTIONS", "10"))
+
+
+class BatchAnalysisUseCase:
+    """여러 문서 + 하나의 질문 세트 분석
+
+    문서들은 모두 동시에 진행되고, 실제 LLM 호출은 문서 간 스케줄러(LLMScheduler)가
+    전역 동시 호출 수 / TPM 한도 안에서 문서별 라운드 로빈으로 배정한다.
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.analysis_usecase = DocumentAnalysisUseCase.getInstance()
+            cls.__instance.scheduler = LLMScheduler.getInstance()
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    # 문서 하나의 그래프: pages -> summary -> (answers, analysis)
+    # qa_mode="retrieval"이면 answers는 요약 대신 원문 청크 검색에 의존
+    def build_document_graph(self, doc_hash: str, path: str, questions: List[str], qa_mode: str = "summary") -> StageGraph:
+        usecase = self.analysis_usecase
+
+        async def answer_all_from_summary(summary: str) -> List[str]:
+            return list(await asyncio.gather(*(usecase.get_or_answer(doc_hash, summary, q) for q in questions)))
+
+        async def answer_all_from_text(pages: List[str]) -> List[str]:
+            text = join_pages(pages)
+            return list(await asyncio.gather(*(qa_on_chunks(doc_hash, text, q) for q in questions)))
+
+        graph = StageGraph()
+        graph.add_stage("pages", lambda: usecase.get_or_extract_pages(doc_hash, path))
+        graph.add_stage("summary", lambda pages: usecase.get_or_summarize(doc_hash, pages), depends_on=["pages"])
+        if qa_mode == "retrieval":
+            graph.add_stage("answers", answer_all_from_text, depends_on=["pages"])
+        else:
+            graph.add_stage("answers", answer_all_from_summary, depends_on=["summary"])
+        graph.add_stage("analysis", lambda summary: usecase.get_or_analyze(doc_hash, summary), depends_on=["summary"])
+        return graph
+
+    async def analyze_one(self, doc_hash: str, path: str, questions: List[str], qa_mode: str = "summary") -> dict:
+        graph = self.build_document_graph(doc_hash, path, questions, qa_mode=qa_mode)
+        # 이 문서에서 파생된 태스크의 LLM 호출은 모두 doc_hash 큐로 스케줄링됨
+        with scheduled_document(doc_hash), collect_request_metrics() as metrics:
+            results, timings = await graph.run()
+        return {
+            "summary": results["summary"],
+            "answers": results["answers"],
+            "analysis": results["analysis"],
+            "timings": timings,
+            "metrics": metrics.to_dict()
+        }
+
+    async def analyze_batch(self, uploads: List[Tuple[str, SpooledUpload]], questions: List[str], qa_mode: str = "summary") -> dict:
+        started = time.perf_counter()
+
+        # 같은 내용의 파일은 한 번만 분석하고 결과를 공유
+        unique: Dict[str, str] = {}
+        for _, upload in uploads:
+            unique.setdefault(upload.sha256, upload.path)
+        outcomes = await asyncio.gather(
+            *(self.analyze_one(doc_hash, path, questions, qa_mode=qa_mode) for doc_hash, path in unique.items()),
+            return_exceptions=True
+        )
+        by_hash = dict(zip(unique, outcomes))
+
+        documents = []
+        for filename, upload in uploads:
+            outcome = by_hash[upload.sha256]
+            if isinstance(outcome, BaseException):
+                documents.append({
+                    "filename": filename,
+                    "document_hash": upload.sha256,
+                    "error": f"{type(outcome).__name__}: {str(outcome)}"
+                })
+                continue
+            documents.append({
+                "filename": filename,
+                "document_hash": upload.sha256,
+                "summary": outcome["summary"],
+                "answers": [{"question": q, "answer": a} for q, a in zip(questions, outcome["answers"])],
+                "analysis": outcome["analysis"],
+                "timings": outcome["timings"],
+                "metrics": outcome["metrics"]
+            })
+
+        # 질문별 통합 답변 (분석에 성공한 문서의 답변만 근거로 사용, 중복 파일은 한 번만)
+        succeeded, seen = [], set()
+        for filename, upload in uploads:
+            outcome = by_hash[upload.sha256]
+            if upload.sha256 not in seen and not isinstance(outcome, BaseException):
+                succeeded.append((filename, outcome))
+            seen.add(upload.sha256)
+
+        async def consolidate(idx: int, question: str) -> str:
+            with scheduled_document(f"consolidate:{idx}"):
+                return await consolidate_answers(
+                    question, [(filename, outcome["answers"][idx]) for filename, outcome in succeeded]
+                )
+
+        consolidated = []
+        if succeeded:
+            answers = await asyncio.gather(*(consolidate(idx, q) for idx, q in enumerate(questions)))
+            consolidated = [{"question": q, "answer": a} for q, a in zip(questions, answers)]
+
+        return {
+            "documents": documents,
+            "consolidated_answers": consolidated,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "scheduler": self.scheduler.stats()
+        }
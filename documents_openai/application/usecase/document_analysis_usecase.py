@@ -0,0 +1,218 @@
+import asyncio
+from typing import Any, Callable, List, Optional
+
+from documents_openai.application.usecase.stage_graph import StageGraph
+from documents_openai.infrastructure.cache.document_result_cache import DocumentResultCache
+from documents_openai.infrastructure.cache.ocr_result_cache import OcrResultCache
+from documents_openai.infrastructure.cache.prompt_cache import PromptCache
+from documents_openai.infrastructure.external.chunk_index import ChunkIndexStore
+from documents_openai.infrastructure.external.chunker import chunk_pages, page_hash
+from documents_openai.infrastructure.external.openai_agents import extract_pages_from_pdf_clean, summarize_document, \
+    qa_on_document, qa_on_chunks, analyze_opinions, analyze_small_document, RETRIEVAL_TOP_K, SINGLE_PASS_MAX_TOKENS
+from documents_openai.infrastructure.external.pdf_extractor import join_pages
+from documents_openai.infrastructure.external.stage_metrics import collect_request_metrics, stage_stats
+from documents_openai.infrastructure.external.tokenizer import count_tokens
+
+QA_MODES = ("summary", "retrieval")
+
+
+class DocumentAnalysisUseCase:
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.result_cache = DocumentResultCache.getInstance()
+            cls.__instance.chunk_index_store = ChunkIndexStore.getInstance()
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    # 캐시를 거치는 파이프라인 단계들
+    async def get_or_extract_pages(self, doc_hash: str, path: str) -> List[str]:
+        pages = await self.result_cache.get_pages(doc_hash)
+        if pages is None:
+            pages = await extract_pages_from_pdf_clean(path)
+            if not any(pages):
+                raise ValueError("No text extracted")
+            await self.result_cache.set_pages(doc_hash, pages)
+        return pages
+
+    async def get_or_extract_text(self, doc_hash: str, path: str) -> str:
+        return join_pages(await self.get_or_extract_pages(doc_hash, path))
+
+    # 증분 요약: 청크는 페이지 경계에 맞춰 나누고 청크 내용 해시로 요약을 캐시하므로,
+    # 개정본 업로드 시 내용이 바뀐 페이지를 포함한 청크만 다시 요약하고 나머지는 재사용
+    async def get_or_summarize(self, doc_hash: str, pages: List[str], on_partial: Optional[Callable[[int, str], None]] = None) -> str:
+        summary = await self.result_cache.get_summary(doc_hash)
+        if summary is not None:
+            return summary
+
+        chunks = chunk_pages(pages)
+        if not chunks:
+            raise RuntimeError("Chunking failed")
+        chunk_hashes = [chunk.content_hash for chunk in chunks]
+
+        cached_partials = await asyncio.gather(*(self.result_cache.get_chunk_summary(h) for h in chunk_hashes))
+        known_partials = {idx: cached for idx, cached in enumerate(cached_partials) if cached is not None}
+
+        # 새 청크 요약은 나오는 즉시 캐시에 저장 (요약이 중간에 실패해도 다음 시도에서 재사용)
+        pending_writes = set()
+
+        def store_partial(idx: int, partial: str):
+            if idx not in known_partials:
+                task = asyncio.create_task(self.result_cache.set_chunk_summary(chunk_hashes[idx], partial))
+                pending_writes.add(task)
+                task.add_done_callback(pending_writes.discard)
+            if on_partial is not None:
+                on_partial(idx, partial)
+
+        try:
+            summary = await summarize_document(
+                [chunk.text for chunk in chunks], on_partial=store_partial, known_partials=known_partials
+            )
+        finally:
+            if pending_writes:
+                await asyncio.gather(*pending_writes, return_exceptions=True)
+        await self.result_cache.set_summary(doc_hash, summary)
+        await self.result_cache.set_manifest(doc_hash, {
+            "page_hashes": [page_hash(page) for page in pages],
+            "chunks": [
+                {"start_page": chunk.start_page, "end_page": chunk.end_page, "hash": chunk_hash}
+                for chunk, chunk_hash in zip(chunks, chunk_hashes)
+            ]
+        })
+        return summary
+
+    # 문서 크기 라우팅: 요약이 없고 한 프롬프트에 들어가는 문서는 요약 + QA + 감성 분석을 한 번에 처리하고
+    # 결과를 각 캐시에 넣어 answer/analysis 단계가 캐시에서 바로 끝나도록 함. 큰 문서는 None (map-reduce 경로)
+    async def get_or_single_pass(self, doc_hash: str, pages: List[str], question: str) -> Optional[dict]:
+        if await self.result_cache.get_summary(doc_hash) is not None:
+            return None
+        text = join_pages(pages)
+        if count_tokens(text) > SINGLE_PASS_MAX_TOKENS:
+            return None
+
+        result = await analyze_small_document(text, question)
+        if result is None:
+            return None
+        await self.result_cache.set_summary(doc_hash, result["summary"])
+        await self.result_cache.set_answer(doc_hash, question, result["answer"])
+        if result["analysis"].get("sentiment") != "unknown":
+            await self.result_cache.set_analysis(doc_hash, result["analysis"])
+        return result
+
+    async def get_or_summarize_routed(
+        self,
+        doc_hash: str,
+        pages: List[str],
+        single_pass: Optional[dict],
+        on_partial: Optional[Callable[[int, str], None]] = None
+    ) -> str:
+        if single_pass is not None:
+            return single_pass["summary"]
+        return await self.get_or_summarize(doc_hash, pages, on_partial=on_partial)
+
+    async def get_or_answer(self, doc_hash: str, summary: str, question: str) -> str:
+        answer = await self.result_cache.get_answer(doc_hash, question)
+        if answer is None:
+            answer = await qa_on_document(summary, question)
+            await self.result_cache.set_answer(doc_hash, question, answer)
+        return answer
+
+    async def get_or_analyze(self, doc_hash: str, summary: str) -> dict:
+        analysis = await self.result_cache.get_analysis(doc_hash)
+        if analysis is None:
+            analysis = await analyze_opinions(summary)
+            # 파싱 실패 결과는 캐시하지 않음
+            if analysis.get("sentiment") != "unknown":
+                await self.result_cache.set_analysis(doc_hash, analysis)
+        return analysis
+
+    @staticmethod
+    async def _join_pages(pages: List[str]) -> str:
+        return join_pages(pages)
+
+    # 분석 파이프라인 의존성 그래프
+    # pages -> (text, single_pass), single_pass -> summary -> (answer, analysis): 요약 이후 에이전트들은 요약에만 의존하므로 동시에 실행됨.
+    # 작은 문서는 single_pass 한 번의 호출로 요약/답변/분석이 모두 캐시에 채워지고, 큰 문서는 single_pass를 건너뛰고 map-reduce로 요약.
+    # 새 에이전트는 add_stage로 추가하면 되고, 요약에만 의존하면 전체 지연 시간이 늘지 않음.
+    # qa_mode="retrieval"이면 answer는 요약 대신 원문 청크 검색에 의존하여 요약과 동시에 실행되고, single_pass 단계는 만들지 않음.
+    def build_analysis_graph(
+        self,
+        doc_hash: str,
+        path: str,
+        question: str,
+        on_partial: Optional[Callable[[int, str], None]] = None,
+        qa_mode: str = "summary"
+    ) -> StageGraph:
+        graph = StageGraph()
+        graph.add_stage("pages", lambda: self.get_or_extract_pages(doc_hash, path))
+        graph.add_stage("text", lambda pages: self._join_pages(pages), depends_on=["pages"])
+        if qa_mode == "retrieval":
+            # 답변은 검색 QA가 만들므로 single_pass(요약+답변 한 번에 생성)는 호출하지 않고 요약만 따로 생성
+            graph.add_stage(
+                "summary",
+                lambda pages: self.get_or_summarize_routed(doc_hash, pages, None, on_partial=on_partial),
+                depends_on=["pages"]
+            )
+            graph.add_stage("answer", lambda text: qa_on_chunks(doc_hash, text, question), depends_on=["text"])
+        else:
+            graph.add_stage("single_pass", lambda pages: self.get_or_single_pass(doc_hash, pages, question), depends_on=["pages"])
+            graph.add_stage(
+                "summary",
+                lambda pages, single_pass: self.get_or_summarize_routed(doc_hash, pages, single_pass, on_partial=on_partial),
+                depends_on=["pages", "single_pass"]
+            )
+            graph.add_stage("answer", lambda summary: self.get_or_answer(doc_hash, summary, question), depends_on=["summary"])
+        graph.add_stage("analysis", lambda summary: self.get_or_analyze(doc_hash, summary), depends_on=["summary"])
+        return graph
+
+    async def analyze_document(
+        self,
+        doc_hash: str,
+        path: str,
+        question: str,
+        qa_mode: str = "summary",
+        on_partial: Optional[Callable[[int, str], None]] = None,
+        on_stage_complete: Optional[Callable[[str, Any], None]] = None
+    ) -> dict:
+        graph = self.build_analysis_graph(doc_hash, path, question, on_partial=on_partial, qa_mode=qa_mode)
+        with collect_request_metrics() as metrics:
+            results, timings = await graph.run(on_stage_complete=on_stage_complete)
+        return {
+            "document_hash": doc_hash,
+            "parsed_text": results["text"],
+            "summary": results["summary"],
+            "answer": results["answer"],
+            "analysis": results["analysis"],
+            "timings": timings,
+            "metrics": metrics.to_dict()
+        }
+
+    # 검색 기반 QA: 이미 인덱싱된 문서는 document_hash만으로 요약 없이 바로 답변
+    async def answer_question(self, doc_hash: str, question: str, path: Optional[str] = None, top_k: int = RETRIEVAL_TOP_K) -> str:
+        if await self.chunk_index_store.contains(doc_hash):
+            text = ""  # 인덱스가 있으면 원문이 필요 없음
+        elif path is not None:
+            text = await self.get_or_extract_text(doc_hash, path)
+        else:
+            text = await self.result_cache.get_text(doc_hash)
+            if text is None:
+                raise LookupError("Document not indexed; upload the file first")
+
+        return await qa_on_chunks(doc_hash, text, question, top_k=max(1, top_k))
+
+    def stage_stats(self) -> dict:
+        return stage_stats.snapshot()
+
+    def cache_stats(self) -> dict:
+        stats = self.result_cache.stats()
+        stats["prompt"] = PromptCache.getInstance().stats()
+        stats["ocr"] = OcrResultCache.getInstance().stats()
+        return stats
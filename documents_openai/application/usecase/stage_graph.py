@@ -0,0 +1,86 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+
+class StageGraph:
+    """파이프라인 단계들의 의존성 그래프
+
+    각 단계는 의존하는 단계의 결과를 같은 이름의 키워드 인자로 받는 코루틴 함수이며,
+    의존성이 모두 끝난 단계부터 바로 실행되므로 서로 독립적인 단계는 동시에 수행된다.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, tuple] = {}
+
+    def add_stage(self, name: str, fn: Callable[..., Awaitable[Any]], depends_on: Iterable[str] = ()):
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self._stages[name] = (fn, tuple(depends_on))
+        return self
+
+    def _validate(self, inputs: Dict[str, Any]):
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited or name in inputs:
+                return
+            if name not in self._stages:
+                raise ValueError(f"Unknown stage dependency: {name}")
+            if name in visiting:
+                raise ValueError(f"Cyclic stage dependency: {name}")
+            visiting.add(name)
+            for dep in self._stages[name][1]:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for stage in self._stages:
+            visit(stage)
+
+    async def run(
+        self,
+        inputs: Optional[Dict[str, Any]] = None,
+        on_stage_complete: Optional[Callable[[str, Any], None]] = None
+    ) -> tuple:
+        """모든 단계를 실행하고 (결과, 단계별 타이밍)을 반환"""
+        inputs = dict(inputs or {})
+        self._validate(inputs)
+
+        origin = time.perf_counter()
+        timings: Dict[str, dict] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def resolve(name: str):
+            if name in inputs:
+                return inputs[name]
+            return await tasks[name]
+
+        async def run_stage(name: str):
+            fn, deps = self._stages[name]
+            dep_results = await asyncio.gather(*(resolve(dep) for dep in deps))
+            started = time.perf_counter()
+            result = await fn(**dict(zip(deps, dep_results)))
+            finished = time.perf_counter()
+            timings[name] = {
+                "start_ms": round((started - origin) * 1000, 1),
+                "duration_ms": round((finished - started) * 1000, 1)
+            }
+            if on_stage_complete is not None:
+                on_stage_complete(name, result)
+            return result
+
+        for name in self._stages:
+            tasks[name] = asyncio.create_task(run_stage(name))
+
+        try:
+            results = await asyncio.gather(*tasks.values())
+        except BaseException:
+            # 한 단계가 실패하면 나머지 단계도 중단
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        timings["total"] = {"start_ms": 0.0, "duration_ms": round((time.perf_counter() - origin) * 1000, 1)}
+        return dict(zip(tasks.keys(), results)), timings
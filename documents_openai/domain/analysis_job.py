@@ -0,0 +1,102 @@
+import time
+import uuid
+from typing import Optional
+
+
+class AnalysisJob:
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STAGES = ("pages", "text", "single_pass", "summary", "answer", "analysis")
+
+    def __init__(
+        self,
+        job_id: str,
+        doc_hash: str,
+        file_path: str,
+        question: str,
+        qa_mode: str = "summary",
+        status: str = STATUS_QUEUED,
+        stages: Optional[dict] = None,
+        partial_summaries: int = 0,
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+        created_at: Optional[float] = None,
+        updated_at: Optional[float] = None,
+    ):
+        self.job_id = job_id
+        self.doc_hash = doc_hash
+        self.file_path = file_path
+        self.question = question
+        self.qa_mode = qa_mode
+        self.status = status
+        self.stages = stages or {stage: "pending" for stage in self.STAGES}
+        self.partial_summaries = partial_summaries
+        self.result = result
+        self.error = error
+        self.created_at = created_at or time.time()
+        self.updated_at = updated_at or self.created_at
+
+    @classmethod
+    def create(cls, doc_hash: str, file_path: str, question: str, qa_mode: str = "summary") -> "AnalysisJob":
+        stages = {stage: "pending" for stage in cls.STAGES}
+        if qa_mode == "retrieval":
+            stages["single_pass"] = "skipped"  # 검색 QA 모드에서는 single_pass 단계를 실행하지 않음
+        return cls(
+            job_id=uuid.uuid4().hex, doc_hash=doc_hash, file_path=file_path, question=question, qa_mode=qa_mode,
+            stages=stages
+        )
+
+    def _touch(self):
+        self.updated_at = time.time()
+
+    def start(self):
+        self.status = self.STATUS_RUNNING
+        self._touch()
+
+    def complete_stage(self, stage: str):
+        self.stages[stage] = "done"
+        self._touch()
+
+    def add_partial_summary(self):
+        self.partial_summaries += 1
+        self._touch()
+
+    def complete(self, result: dict):
+        self.status = self.STATUS_DONE
+        self.result = result
+        self._touch()
+
+    def fail(self, error: str):
+        self.status = self.STATUS_FAILED
+        self.error = error
+        self._touch()
+
+    def is_finished(self) -> bool:
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "doc_hash": self.doc_hash,
+            "file_path": self.file_path,
+            "question": self.question,
+            "qa_mode": self.qa_mode,
+            "status": self.status,
+            "stages": self.stages,
+            "partial_summaries": self.partial_summaries,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+    # 진행 중에 바뀌는 필드를 복사한 사본 (다른 스레드에서 저장하는 동안 원본이 바뀌어도 영향 없음)
+    def snapshot(self) -> "AnalysisJob":
+        return AnalysisJob.from_dict({**self.to_dict(), "stages": dict(self.stages)})
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AnalysisJob":
+        return cls(**data)
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import re
+import unicodedata
+from typing import List, Optional
+
+from documents_openai.infrastructure.cache.two_tier_cache import TwoTierCache
+
+CACHE_LOCAL_ENTRIES = int(os.getenv("DOCUMENTS_OPENAI_CACHE_LOCAL_ENTRIES", "256"))
+CHUNK_SUMMARY_LOCAL_ENTRIES = int(os.getenv("DOCUMENTS_OPENAI_CHUNK_SUMMARY_CACHE_ENTRIES", "4096"))
+# 캐시별 1차(프로세스 내) 캐시 용량 한도 (페이지 캐시는 문서 전체 텍스트를 담으므로 따로 지정)
+CACHE_LOCAL_MAX_BYTES = int(os.getenv("DOCUMENTS_OPENAI_CACHE_LOCAL_MAX_BYTES", str(16 * 1024 * 1024)))
+PAGES_CACHE_LOCAL_MAX_BYTES = int(os.getenv("DOCUMENTS_OPENAI_PAGES_CACHE_LOCAL_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_TTL_SECONDS = int(os.getenv("DOCUMENTS_OPENAI_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+CACHE_USE_REDIS = os.getenv("DOCUMENTS_OPENAI_CACHE_REDIS", "true").lower() == "true"
+
+
+# 질문 정규화 (유니코드/공백/대소문자/끝 문장부호 차이는 같은 질문으로 취급)
+def normalize_question(question: str) -> str:
+    q = unicodedata.normalize("NFKC", question)
+    q = re.sub(r"\s+", " ", q).strip().casefold()
+    return q.rstrip("?？.!。 ")
+
+
+class DocumentResultCache:
+    """문서 내용(SHA-256) 기준 분석 결과 캐시"""
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.pages_cache = cls.__instance._create("pages", max_bytes=PAGES_CACHE_LOCAL_MAX_BYTES)
+            cls.__instance.manifest_cache = cls.__instance._create("manifest")
+            cls.__instance.chunk_summary_cache = cls.__instance._create("chunk_summary", CHUNK_SUMMARY_LOCAL_ENTRIES)
+            cls.__instance.summary_cache = cls.__instance._create("summary")
+            cls.__instance.answer_cache = cls.__instance._create("answer")
+            cls.__instance.analysis_cache = cls.__instance._create("analysis")
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    @staticmethod
+    def _create(
+        name: str, max_entries: int = CACHE_LOCAL_ENTRIES, max_bytes: int = CACHE_LOCAL_MAX_BYTES
+    ) -> TwoTierCache:
+        return TwoTierCache(
+            namespace=f"documents_openai:{name}",
+            max_entries=max_entries,
+            ttl_seconds=CACHE_TTL_SECONDS,
+            use_redis=CACHE_USE_REDIS,
+            max_bytes=max_bytes
+        )
+
+    @staticmethod
+    def _answer_key(doc_hash: str, question: str) -> str:
+        question_hash = hashlib.sha256(normalize_question(question).encode()).hexdigest()
+        return f"{doc_hash}:{question_hash}"
+
+    # 페이지별 텍스트 (텍스트가 없는 페이지는 빈 문자열로 유지하여 페이지 번호 보존)
+    async def get_pages(self, doc_hash: str) -> Optional[List[str]]:
+        return await self.pages_cache.get(doc_hash)
+
+    async def set_pages(self, doc_hash: str, pages: List[str]):
+        await self.pages_cache.set(doc_hash, pages)
+
+    async def get_text(self, doc_hash: str) -> Optional[str]:
+        pages = await self.get_pages(doc_hash)
+        return None if pages is None else "\n".join(p for p in pages if p)
+
+    # 문서 구성 정보: 페이지 해시 + 청크별 페이지 구간/내용 해시
+    async def get_manifest(self, doc_hash: str) -> Optional[dict]:
+        return await self.manifest_cache.get(doc_hash)
+
+    async def set_manifest(self, doc_hash: str, manifest: dict):
+        await self.manifest_cache.set(doc_hash, manifest)
+
+    # 청크 요약은 문서가 아닌 청크 내용 해시 기준 (개정본/다른 문서와 공유)
+    async def get_chunk_summary(self, chunk_hash: str) -> Optional[str]:
+        return await self.chunk_summary_cache.get(chunk_hash)
+
+    async def set_chunk_summary(self, chunk_hash: str, summary: str):
+        await self.chunk_summary_cache.set(chunk_hash, summary)
+
+    async def get_summary(self, doc_hash: str) -> Optional[str]:
+        return await self.summary_cache.get(doc_hash)
+
+    async def set_summary(self, doc_hash: str, summary: str):
+        await self.summary_cache.set(doc_hash, summary)
+
+    async def get_answer(self, doc_hash: str, question: str) -> Optional[str]:
+        return await self.answer_cache.get(self._answer_key(doc_hash, question))
+
+    async def set_answer(self, doc_hash: str, question: str, answer: str):
+        await self.answer_cache.set(self._answer_key(doc_hash, question), answer)
+
+    async def get_analysis(self, doc_hash: str) -> Optional[dict]:
+        return await self.analysis_cache.get(doc_hash)
+
+    async def set_analysis(self, doc_hash: str, analysis: dict):
+        await self.analysis_cache.set(doc_hash, analysis)
+
+    def stats(self) -> dict:
+        return {
+            "pages": self.pages_cache.stats(),
+            "manifest": self.manifest_cache.stats(),
+            "chunk_summary": self.chunk_summary_cache.stats(),
+            "summary": self.summary_cache.stats(),
+            "answer": self.answer_cache.stats(),
+            "analysis": self.analysis_cache.stats()
+        }
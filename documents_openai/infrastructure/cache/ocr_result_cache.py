@@ -0,0 +1,47 @@
+import os
+from typing import Optional
+
+from documents_openai.infrastructure.cache.two_tier_cache import TwoTierCache
+
+OCR_CACHE_LOCAL_ENTRIES = int(os.getenv("DOCUMENTS_OPENAI_OCR_CACHE_LOCAL_ENTRIES", "4096"))
+OCR_CACHE_LOCAL_MAX_BYTES = int(os.getenv("DOCUMENTS_OPENAI_OCR_CACHE_LOCAL_MAX_BYTES", str(32 * 1024 * 1024)))
+OCR_CACHE_TTL_SECONDS = int(os.getenv("DOCUMENTS_OPENAI_OCR_CACHE_TTL_SECONDS", str(90 * 24 * 3600)))
+OCR_CACHE_USE_REDIS = os.getenv("DOCUMENTS_OPENAI_OCR_CACHE_REDIS", "true").lower() == "true"
+
+
+class OcrResultCache:
+    """스캔 페이지 OCR 결과 캐시 (렌더링한 페이지 이미지 해시 + 언어 기준)"""
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.cache = TwoTierCache(
+                namespace="documents_openai:ocr",
+                max_entries=OCR_CACHE_LOCAL_ENTRIES,
+                ttl_seconds=OCR_CACHE_TTL_SECONDS,
+                use_redis=OCR_CACHE_USE_REDIS,
+                max_bytes=OCR_CACHE_LOCAL_MAX_BYTES
+            )
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    @staticmethod
+    def make_key(image_hash: str, lang: str) -> str:
+        return f"{lang}:{image_hash}"
+
+    # 글자가 없는 페이지("")도 결과로 저장하여 다시 OCR하지 않음
+    async def get(self, image_hash: str, lang: str) -> Optional[str]:
+        return await self.cache.get(self.make_key(image_hash, lang))
+
+    async def set(self, image_hash: str, lang: str, text: str):
+        await self.cache.set(self.make_key(image_hash, lang), text)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
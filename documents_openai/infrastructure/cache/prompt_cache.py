@@ -0,0 +1,52 @@
+import hashlib
+import os
+from typing import Optional
+
+from documents_openai.infrastructure.cache.two_tier_cache import TwoTierCache
+
+PROMPT_CACHE_ENABLED = os.getenv("DOCUMENTS_OPENAI_PROMPT_CACHE", "true").lower() == "true"
+PROMPT_CACHE_LOCAL_ENTRIES = int(os.getenv("DOCUMENTS_OPENAI_PROMPT_CACHE_LOCAL_ENTRIES", "4096"))
+PROMPT_CACHE_LOCAL_MAX_BYTES = int(os.getenv("DOCUMENTS_OPENAI_PROMPT_CACHE_LOCAL_MAX_BYTES", str(64 * 1024 * 1024)))
+PROMPT_CACHE_TTL_SECONDS = int(os.getenv("DOCUMENTS_OPENAI_PROMPT_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+PROMPT_CACHE_USE_REDIS = os.getenv("DOCUMENTS_OPENAI_PROMPT_CACHE_REDIS", "true").lower() == "true"
+
+
+class PromptCache:
+    """temperature=0 GPT 호출 결과 캐시 (model, max_tokens, prompt 해시 기준)"""
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.enabled = PROMPT_CACHE_ENABLED
+            cls.__instance.cache = TwoTierCache(
+                namespace="documents_openai:prompt",
+                max_entries=PROMPT_CACHE_LOCAL_ENTRIES,
+                ttl_seconds=PROMPT_CACHE_TTL_SECONDS,
+                use_redis=PROMPT_CACHE_USE_REDIS,
+                max_bytes=PROMPT_CACHE_LOCAL_MAX_BYTES
+            )
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    @staticmethod
+    def make_key(model: str, prompt: str, max_tokens: int) -> str:
+        return hashlib.sha256(f"{model}\0{max_tokens}\0{prompt}".encode()).hexdigest()
+
+    async def get(self, model: str, prompt: str, max_tokens: int) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return await self.cache.get(self.make_key(model, prompt, max_tokens))
+
+    async def set(self, model: str, prompt: str, max_tokens: int, completion: str):
+        if self.enabled and completion:
+            await self.cache.set(self.make_key(model, prompt, max_tokens), completion)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Redis 오류 후 이 시간 동안은 Redis를 건너뛰고 1차 캐시만 사용 (장애 중 조회마다 타임아웃을 기다리지 않도록 함)
+REDIS_CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("DOCUMENTS_OPENAI_CACHE_REDIS_COOLDOWN_SECONDS", "30"))
+
+
+class RedisCircuit:
+    """Redis 서킷 브레이커 (모든 캐시 네임스페이스가 같은 Redis를 쓰므로 프로세스에서 하나를 공유)"""
+
+    def __init__(self, cooldown_seconds: float):
+        self.cooldown_seconds = cooldown_seconds
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.skipped = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if time.monotonic() < self._open_until:
+                self.skipped += 1
+                return False
+            return True
+
+    def record_failure(self, namespace: str, error: Exception):
+        with self._lock:
+            was_closed = time.monotonic() >= self._open_until
+            self._open_until = time.monotonic() + self.cooldown_seconds
+            self.failures += 1
+        if was_closed:
+            print(f"[CACHE] Redis failed ({namespace}), local only for {self.cooldown_seconds:.0f}s: {error}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"open": time.monotonic() < self._open_until, "failures": self.failures, "skipped": self.skipped}
+
+
+redis_circuit = RedisCircuit(REDIS_CIRCUIT_COOLDOWN_SECONDS)
+
+
+class TwoTierCache:
+    """프로세스 내 LRU(1차) + Redis(2차) 캐시
+
+    - 1차 캐시에서 찾지 못하면 Redis를 조회하고, Redis에서 찾은 값은 1차 캐시에 다시 올림
+    - Redis 장애 시에는 1차 캐시만으로 동작 (요청 실패로 이어지지 않도록 함)
+    - Redis 호출은 짧은 소켓 타임아웃으로 스레드에서 실행하여 이벤트 루프를 막지 않고,
+      실패하면 서킷 브레이커가 일정 시간 Redis를 건너뜀
+    - 값은 JSON 직렬화 가능한 객체만 저장
+    - 1차 캐시는 항목 수(max_entries)와 선택적으로 직렬화 크기 합(max_bytes)으로 제한하며, TTL이 지난 항목은 조회 시 제거
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 256,
+        ttl_seconds: Optional[int] = None,
+        use_redis: bool = True,
+        max_bytes: Optional[int] = None
+    ):
+        self.namespace = namespace
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.max_bytes = max_bytes
+        # key -> (만료 시각, 크기, 값)
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._local_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expired": 0}
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _redis(self):
+        if not self.use_redis or not redis_circuit.allow():
+            return None
+        try:
+            # redis 설정은 환경변수가 있어야 로드되므로 실제 사용 시점에 import
+            from config.redis_config import get_cache_redis
+            return get_cache_redis()
+        except Exception as e:
+            # 설정 자체가 없으면 이후에는 Redis 계층을 사용하지 않음
+            print(f"[CACHE] Redis unavailable ({self.namespace}), local only: {e}")
+            self.use_redis = False
+            return None
+
+    def _pop_local(self, key: str):
+        _, size, _ = self._local.pop(key)
+        self._local_bytes -= size
+
+    def _put_local(self, key: str, value: Any, size: int):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            if key in self._local:
+                self._pop_local(key)
+            self._local[key] = (expires_at, size, value)
+            self._local_bytes += size
+            while len(self._local) > self.max_entries or (
+                self.max_bytes is not None and self._local_bytes > self.max_bytes and len(self._local) > 1
+            ):
+                self._pop_local(next(iter(self._local)))
+                self._stats["evictions"] += 1
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._local:
+                expires_at, _, value = self._local[key]
+                if expires_at is not None and expires_at < time.monotonic():
+                    self._pop_local(key)
+                    self._stats["expired"] += 1
+                else:
+                    self._local.move_to_end(key)
+                    self._stats["local_hits"] += 1
+                    return value
+        return None
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self._get_local(key)
+        if value is not None:
+            return value
+
+        client = self._redis()
+        if client is not None:
+            try:
+                raw = await asyncio.to_thread(client.get, self._redis_key(key))
+            except Exception as e:
+                redis_circuit.record_failure(self.namespace, e)
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._put_local(key, value, len(raw))
+                with self._lock:
+                    self._stats["redis_hits"] += 1
+                return value
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any):
+        raw = json.dumps(value, ensure_ascii=False)
+        self._put_local(key, value, len(raw))
+        with self._lock:
+            self._stats["sets"] += 1
+
+        client = self._redis()
+        if client is not None:
+            try:
+                await asyncio.to_thread(client.set, self._redis_key(key), raw, ex=self.ttl_seconds)
+            except Exception as e:
+                redis_circuit.record_failure(self.namespace, e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_entries"] = len(self._local)
+            stats["local_bytes"] = self._local_bytes
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["local_hits"] + stats["redis_hits"]) / lookups, 4) if lookups else 0.0
+        stats["redis_circuit"] = redis_circuit.stats()
+        return stats
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+            self._local_bytes = 0
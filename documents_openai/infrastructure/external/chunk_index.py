@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from documents_openai.infrastructure.external.chunker import chunk_text
+from documents_openai.infrastructure.external.llm_client import embed_texts
+
+# 검색용 청크는 요약용보다 작게 잘라 질문과 관련된 부분만 가져오도록 함
+RETRIEVAL_CHUNK_TOKENS = int(os.getenv("DOCUMENTS_OPENAI_RETRIEVAL_CHUNK_TOKENS", "600"))
+RETRIEVAL_OVERLAP_TOKENS = int(os.getenv("DOCUMENTS_OPENAI_RETRIEVAL_OVERLAP_TOKENS", "80"))
+INDEX_DIR = os.getenv("DOCUMENTS_OPENAI_INDEX_DIR", "./cache/documents_openai/index")
+INDEX_CACHE_ENTRIES = int(os.getenv("DOCUMENTS_OPENAI_INDEX_CACHE_ENTRIES", "32"))
+
+# 문서 해시(SHA-256 hex)는 인덱스 파일 이름으로 쓰이므로 형식이 맞는 값만 허용 (경로 이탈 방지)
+DOCUMENT_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_document_hash(value: str) -> bool:
+    return bool(DOCUMENT_HASH_PATTERN.match(value or ""))
+
+
+@dataclass
+class ChunkIndex:
+    """문서 하나의 청크 + FAISS 인덱스 (코사인 유사도 = 정규화 벡터 내적)"""
+    index: faiss.Index
+    chunks: List[str]
+
+    def search(self, query_embedding: List[float], top_k: int) -> List[Tuple[int, float, str]]:
+        query = np.asarray([query_embedding], dtype="float32")
+        faiss.normalize_L2(query)
+        scores, ids = self.index.search(query, min(top_k, len(self.chunks)))
+        return [(int(i), float(score), self.chunks[i]) for i, score in zip(ids[0], scores[0]) if i >= 0]
+
+
+class ChunkIndexStore:
+    """문서 내용 해시 기준 청크 인덱스 저장소 (메모리 LRU + 디스크)"""
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance._indexes = OrderedDict()
+            cls.__instance._building = {}
+            cls.__instance._lock = threading.Lock()
+            os.makedirs(INDEX_DIR, exist_ok=True)
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    @staticmethod
+    def _paths(doc_hash: str) -> Tuple[str, str]:
+        if not is_document_hash(doc_hash):
+            raise ValueError(f"Invalid document hash: {doc_hash!r}")
+        return os.path.join(INDEX_DIR, f"{doc_hash}.faiss"), os.path.join(INDEX_DIR, f"{doc_hash}.json")
+
+    def _remember(self, doc_hash: str, chunk_index: ChunkIndex):
+        with self._lock:
+            self._indexes[doc_hash] = chunk_index
+            self._indexes.move_to_end(doc_hash)
+            while len(self._indexes) > INDEX_CACHE_ENTRIES:
+                self._indexes.popitem(last=False)
+
+    # 디스크의 인덱스/청크 파일 읽기와 쓰기는 이벤트 루프를 막지 않도록 스레드에서 수행
+    async def get(self, doc_hash: str) -> Optional[ChunkIndex]:
+        with self._lock:
+            if doc_hash in self._indexes:
+                self._indexes.move_to_end(doc_hash)
+                return self._indexes[doc_hash]
+
+        chunk_index = await asyncio.to_thread(self._load, doc_hash)
+        if chunk_index is not None:
+            self._remember(doc_hash, chunk_index)
+        return chunk_index
+
+    def _load(self, doc_hash: str) -> Optional[ChunkIndex]:
+        index_path, chunks_path = self._paths(doc_hash)
+        if not (os.path.exists(index_path) and os.path.exists(chunks_path)):
+            return None
+        with open(chunks_path, "r", encoding="utf-8") as f:
+            chunks = json.load(f)
+        return ChunkIndex(index=faiss.read_index(index_path), chunks=chunks)
+
+    async def contains(self, doc_hash: str) -> bool:
+        return await self.get(doc_hash) is not None
+
+    async def _build(self, doc_hash: str, text: str) -> ChunkIndex:
+        chunks = chunk_text(text, RETRIEVAL_CHUNK_TOKENS, RETRIEVAL_OVERLAP_TOKENS)
+        if not chunks:
+            raise ValueError("No chunks to index")
+
+        embeddings = np.asarray(await embed_texts(chunks), dtype="float32")
+        faiss.normalize_L2(embeddings)
+        index = faiss.IndexFlatIP(embeddings.shape[1])
+        index.add(embeddings)
+        await asyncio.to_thread(self._write, doc_hash, index, chunks)
+
+        chunk_index = ChunkIndex(index=index, chunks=chunks)
+        self._remember(doc_hash, chunk_index)
+        return chunk_index
+
+    # 임시 파일에 쓴 뒤 교체하여 부분적으로 기록된 인덱스를 읽지 않도록 함
+    def _write(self, doc_hash: str, index: faiss.Index, chunks: List[str]):
+        index_path, chunks_path = self._paths(doc_hash)
+        faiss.write_index(index, index_path + ".tmp")
+        with open(chunks_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(chunks, f, ensure_ascii=False)
+        os.replace(chunks_path + ".tmp", chunks_path)
+        os.replace(index_path + ".tmp", index_path)
+
+    # 문서당 한 번만 임베딩 (같은 문서에 대한 동시 요청은 하나의 빌드를 공유)
+    async def get_or_build(self, doc_hash: str, text: str) -> ChunkIndex:
+        chunk_index = await self.get(doc_hash)
+        if chunk_index is not None:
+            return chunk_index
+
+        task = self._building.get(doc_hash)
+        if task is None:
+            task = asyncio.create_task(self._build(doc_hash, text))
+            self._building[doc_hash] = task
+            task.add_done_callback(lambda _: self._building.pop(doc_hash, None))
+        return await asyncio.shield(task)
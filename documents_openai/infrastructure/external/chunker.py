@@ -0,0 +1,173 @@
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from documents_openai.infrastructure.external.tokenizer import count_tokens, decode, encode
+
+# 청크 크기는 문자 수가 아닌 토큰 수 기준 (한글/영문 토큰 밀도 차이 보정)
+CHUNK_TARGET_TOKENS = int(os.getenv("DOCUMENTS_OPENAI_CHUNK_TOKENS", "4000"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("DOCUMENTS_OPENAI_CHUNK_OVERLAP_TOKENS", "200"))
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?。])\s+')
+
+
+def _split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+
+
+# 목표 토큰 수를 넘는 단일 문단만 문장 단위(최후에는 토큰 단위)로 분할
+def _split_oversized(paragraph: str, target_tokens: int) -> List[Tuple[str, int]]:
+    pieces: List[Tuple[str, int]] = []
+    cur, cur_tokens = [], 0
+    for sentence in _split_sentences(paragraph):
+        n = count_tokens(sentence) + 1
+        if n > target_tokens:
+            if cur:
+                pieces.append((" ".join(cur), cur_tokens))
+                cur, cur_tokens = [], 0
+            tokens = encode(sentence)
+            for i in range(0, len(tokens), target_tokens):
+                part = tokens[i:i + target_tokens]
+                pieces.append((decode(part), len(part)))
+            continue
+        if cur and cur_tokens + n > target_tokens:
+            pieces.append((" ".join(cur), cur_tokens))
+            cur, cur_tokens = [], 0
+        cur.append(sentence)
+        cur_tokens += n
+    if cur:
+        pieces.append((" ".join(cur), cur_tokens))
+    return pieces
+
+
+# 이전 청크의 끝 문장들을 overlap 토큰 한도 내에서 가져옴
+def _overlap_tail(units: List[Tuple[str, int]], overlap_tokens: int) -> Tuple[str, int]:
+    if overlap_tokens <= 0 or not units:
+        return "", 0
+    tail, tail_tokens = [], 0
+    for sentence in reversed(_split_sentences(" ".join(u for u, _ in units))):
+        n = count_tokens(sentence) + 1
+        if tail_tokens + n > overlap_tokens:
+            break
+        tail.insert(0, sentence)
+        tail_tokens += n
+    return " ".join(tail), tail_tokens
+
+
+# 토큰 예산 기반 청킹: 문단을 자르지 않고 목표 토큰 수까지 채우며, 청크 사이에 overlap 적용
+def chunk_text(text: str, target_tokens: int = CHUNK_TARGET_TOKENS, overlap_tokens: int = CHUNK_OVERLAP_TOKENS) -> List[str]:
+    target_tokens = max(1, target_tokens)
+    overlap_tokens = min(max(0, overlap_tokens), target_tokens // 2)
+
+    units: List[Tuple[str, int]] = []
+    for p in (p.strip() for p in text.split("\n")):
+        if not p:
+            continue
+        n = count_tokens(p) + 1  # 문단 구분자 포함
+        if n <= target_tokens:
+            units.append((p, n))
+        else:
+            units.extend(_split_oversized(p, target_tokens))
+
+    chunks: List[str] = []
+    overlap, overlap_n = "", 0
+    cur: List[Tuple[str, int]] = []
+    cur_tokens = 0
+    for unit, n in units:
+        if cur and overlap_n + cur_tokens + n > target_tokens:
+            chunks.append("\n".join(([overlap] if overlap else []) + [u for u, _ in cur]))
+            overlap, overlap_n = _overlap_tail(cur, overlap_tokens)
+            cur, cur_tokens = [], 0
+        if not cur and overlap_n + n > target_tokens:
+            # overlap을 붙이면 예산을 넘는 경우 overlap 없이 시작
+            overlap, overlap_n = "", 0
+        cur.append((unit, n))
+        cur_tokens += n
+    if cur:
+        chunks.append("\n".join(([overlap] if overlap else []) + [u for u, _ in cur]))
+
+    return chunks
+
+
+# 페이지 정렬 청킹 설정: 페이지 해시로 정해지는 경계(content-defined boundary)의 평균 간격(페이지 수)
+CHUNK_BOUNDARY_PAGES = max(1, int(os.getenv("DOCUMENTS_OPENAI_CHUNK_BOUNDARY_PAGES", "8")))
+# 내용 기반 경계는 청크가 목표 토큰 수의 이 비율 이상 찼을 때만 적용 (작은 청크가 늘어 LLM 호출이 많아지지 않도록)
+CHUNK_BOUNDARY_MIN_FILL = min(1.0, max(0.0, float(os.getenv("DOCUMENTS_OPENAI_CHUNK_BOUNDARY_MIN_FILL", "0.5"))))
+
+
+@dataclass
+class PageChunk:
+    """페이지 구간 [start_page, end_page)에 대응하는 청크"""
+    start_page: int
+    end_page: int
+    text: str
+
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.text.encode()).hexdigest()
+
+
+def page_hash(page: str) -> str:
+    return hashlib.sha256(page.encode()).hexdigest()
+
+
+def _is_boundary_page(page: str, boundary_pages: int) -> bool:
+    return int(page_hash(page)[:8], 16) % boundary_pages == 0
+
+
+# 페이지 단위 청킹 (증분 재분석용)
+# - 청크는 항상 페이지 경계에서 나뉘고, 경계는 토큰 예산과 페이지 내용 해시로만 결정됨
+# - 내용 기반 경계는 청크가 min_fill 이상 찼을 때만 적용하여 청크를 목표 크기에 가깝게 유지
+# - 따라서 한 페이지가 바뀌어도 다음 내용 기반 경계 이후의 청크는 그대로 유지되어 요약을 재사용할 수 있음
+# - overlap은 직전 페이지의 끝 문장들로 채우므로 역시 페이지 내용에만 의존
+def chunk_pages(
+    pages: List[str],
+    target_tokens: int = CHUNK_TARGET_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+    boundary_pages: int = CHUNK_BOUNDARY_PAGES,
+    min_fill: float = CHUNK_BOUNDARY_MIN_FILL
+) -> List[PageChunk]:
+    target_tokens = max(1, target_tokens)
+    overlap_tokens = min(max(0, overlap_tokens), target_tokens // 2)
+    min_tokens = int(target_tokens * min_fill)
+
+    chunks: List[PageChunk] = []
+    cur: List[str] = []
+    cur_tokens, start = 0, 0
+
+    def overlap_for(page_idx: int) -> str:
+        prev = next((pages[i] for i in range(page_idx - 1, -1, -1) if pages[i]), None)
+        return _overlap_tail([(prev, 0)], overlap_tokens)[0] if prev else ""
+
+    def flush(end: int):
+        nonlocal cur, cur_tokens
+        if cur:
+            overlap = overlap_for(start)
+            chunks.append(PageChunk(start, end, "\n".join(([overlap] if overlap else []) + cur)))
+        cur, cur_tokens = [], 0
+
+    for idx, page in enumerate(pages):
+        if not page:
+            continue
+        n = count_tokens(page) + 1
+        if n + overlap_tokens > target_tokens:
+            # 한 페이지가 예산보다 크면 해당 페이지만 문단/문장 단위로 나눔
+            flush(idx)
+            for part in chunk_text(page, target_tokens - overlap_tokens, 0):
+                overlap = overlap_for(idx) if not chunks or chunks[-1].start_page != idx else ""
+                chunks.append(PageChunk(idx, idx + 1, "\n".join(([overlap] if overlap else []) + [part])))
+            start = idx + 1
+            continue
+        if cur and cur_tokens + n + overlap_tokens > target_tokens:
+            flush(idx)
+        if not cur:
+            start = idx
+        cur.append(page)
+        cur_tokens += n
+        if _is_boundary_page(page, boundary_pages) and cur_tokens + overlap_tokens >= min_tokens:
+            flush(idx + 1)
+
+    flush(len(pages))
+    return chunks
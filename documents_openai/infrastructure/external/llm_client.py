@@ -0,0 +1,60 @@
+import asyncio
+import os
+import time
+from typing import List
+
+from config.openai.config import get_async_openai_client
+from documents_openai.infrastructure.cache.prompt_cache import PromptCache
+from documents_openai.infrastructure.external.llm_scheduler import llm_slot
+from documents_openai.infrastructure.external.stage_metrics import record_llm_usage, record_queue_wait
+from documents_openai.infrastructure.external.tokenizer import count_tokens
+
+# 문서 파이프라인에서 사용하는 모델
+DOCUMENTS_OPENAI_MODEL = os.getenv("DOCUMENTS_OPENAI_MODEL", "gpt-4.1")
+
+
+# GPT 호출 래퍼 (공유 AsyncOpenAI 클라이언트 사용, 스레드 풀을 점유하지 않음)
+# temperature=0이므로 같은 (model, prompt, max_tokens)는 캐시된 응답을 재사용
+# 배치 분석 중이면 실제 API 호출만 문서 간 스케줄러(전역 동시 호출 수 / TPM)를 거침
+async def ask_gpt(prompt: str, max_tokens=500) -> str:
+    prompt_cache = PromptCache.getInstance()
+    cached = await prompt_cache.get(DOCUMENTS_OPENAI_MODEL, prompt, max_tokens)
+    if cached is not None:
+        record_llm_usage(cached=True)
+        return cached
+
+    client = get_async_openai_client()
+    queued = time.perf_counter()
+    async with llm_slot(lambda: count_tokens(prompt) + max_tokens):
+        record_queue_wait(time.perf_counter() - queued)
+        response = await client.chat.completions.create(
+            model=DOCUMENTS_OPENAI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0
+        )
+    if response.usage is not None:
+        record_llm_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+    completion = response.choices[0].message.content or ""
+    await prompt_cache.set(DOCUMENTS_OPENAI_MODEL, prompt, max_tokens, completion)
+    return completion
+
+
+# 임베딩 (검색 기반 QA용)
+DOCUMENTS_OPENAI_EMBEDDING_MODEL = os.getenv("DOCUMENTS_OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_BATCH_SIZE = int(os.getenv("DOCUMENTS_OPENAI_EMBEDDING_BATCH_SIZE", "128"))
+
+
+async def embed_texts(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> List[List[float]]:
+    client = get_async_openai_client()
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), max(1, batch_size))]
+
+    async def embed_batch(batch: List[str]):
+        async with llm_slot(lambda: sum(count_tokens(text) for text in batch)):
+            return await client.embeddings.create(model=DOCUMENTS_OPENAI_EMBEDDING_MODEL, input=batch)
+
+    responses = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+    for response in responses:
+        if response.usage is not None:
+            record_llm_usage(response.usage.prompt_tokens)
+    return [item.embedding for response in responses for item in sorted(response.data, key=lambda d: d.index)]
@@ -0,0 +1,146 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Callable, Deque, Optional, Tuple
+
+# 배치 분석에서 모든 문서가 공유하는 전역 동시 호출 수 / 분당 토큰(TPM) 한도
+LLM_SCHEDULER_CONCURRENCY = int(os.getenv("DOCUMENTS_OPENAI_SCHEDULER_CONCURRENCY", "16"))
+LLM_SCHEDULER_TOKENS_PER_MINUTE = int(os.getenv("DOCUMENTS_OPENAI_TOKENS_PER_MINUTE", "200000"))
+
+
+class LLMScheduler:
+    """문서 간 LLM 호출 스케줄러
+
+    - 전역 동시 호출 수와 분당 토큰 버킷(프롬프트 + 응답 상한 기준)을 함께 제한
+    - 대기 중인 호출은 문서(key)별 큐에 넣고 문서 간 라운드 로빈으로 배정하여,
+      먼저 들어온 문서가 슬롯을 독점하지 않고 모든 문서의 청크 요약이 번갈아 진행되도록 함
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.configure(LLM_SCHEDULER_CONCURRENCY, LLM_SCHEDULER_TOKENS_PER_MINUTE)
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def configure(self, concurrency: int, tokens_per_minute: int):
+        self.concurrency = max(1, concurrency)
+        self.tokens_per_minute = max(1, tokens_per_minute)
+        self._active = 0
+        self._tokens = float(self.tokens_per_minute)
+        self._updated = time.monotonic()
+        # key -> 대기 중인 (토큰 수, future) 큐. 순서가 곧 라운드 로빈 순서
+        self._queues: "OrderedDict[str, Deque[Tuple[int, asyncio.Future]]]" = OrderedDict()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._stats = {"granted": 0, "reserved_tokens": 0, "rate_limited_waits": 0}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + (now - self._updated) * self.tokens_per_minute / 60
+        )
+        self._updated = now
+
+    def _dispatch(self):
+        self._refill()
+        while self._active < self.concurrency and self._queues:
+            key, queue = next(iter(self._queues.items()))
+            while queue and queue[0][1].done():  # 대기 중 취소된 호출
+                queue.popleft()
+            if not queue:
+                del self._queues[key]
+                continue
+
+            tokens, future = queue[0]
+            if tokens > self._tokens:
+                # 버킷이 찰 때까지 기다렸다가 다시 배정 (순서를 지키기 위해 뒤 호출도 대기)
+                if self._wakeup is None:
+                    delay = (tokens - self._tokens) * 60 / self.tokens_per_minute
+                    self._wakeup = asyncio.get_running_loop().call_later(delay, self._on_wakeup)
+                    self._stats["rate_limited_waits"] += 1
+                break
+
+            queue.popleft()
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            self._tokens -= tokens
+            self._active += 1
+            self._stats["granted"] += 1
+            self._stats["reserved_tokens"] += tokens
+            future.set_result(None)
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._dispatch()
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def acquire(self, key: str, tokens: int):
+        # 버킷보다 큰 단일 호출은 버킷 크기만큼만 예약하여 단독으로라도 실행되도록 함
+        tokens = min(max(1, tokens), self.tokens_per_minute)
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append((tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():  # 배정 직후 취소된 경우 슬롯 반환
+                self._release()
+            else:
+                future.cancel()
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            **self._stats,
+            "concurrency": self.concurrency,
+            "tokens_per_minute": self.tokens_per_minute,
+            "active": self._active,
+            "waiting": sum(len(queue) for queue in self._queues.values()),
+            "available_tokens": int(self._tokens)
+        }
+
+
+# 현재 태스크가 속한 문서 (설정된 경우에만 LLM 호출이 스케줄러를 거침)
+_current_key: ContextVar[Optional[str]] = ContextVar("documents_openai_scheduler_key", default=None)
+
+
+@contextmanager
+def scheduled_document(key: str):
+    token = _current_key.set(key)
+    try:
+        yield
+    finally:
+        _current_key.reset(token)
+
+
+# 토큰 수는 스케줄러를 거칠 때만 계산 (일반 요청에서는 토큰화 비용 없음)
+@asynccontextmanager
+async def llm_slot(estimate_tokens: Callable[[], int]):
+    key = _current_key.get()
+    if key is None:
+        yield
+        return
+    async with LLMScheduler.getInstance().acquire(key, estimate_tokens()):
+        yield
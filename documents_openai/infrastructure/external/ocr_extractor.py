@@ -0,0 +1,86 @@
+import asyncio
+import hashlib
+import io
+import os
+from typing import Dict, List, Tuple
+
+from documents_openai.infrastructure.cache.ocr_result_cache import OcrResultCache
+from documents_openai.infrastructure.external.pdf_extractor import PDF_WORKERS, clean_page_text, fitz, get_pdf_pool
+from documents_openai.infrastructure.external.stage_metrics import record_chunks
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:
+    pytesseract = None
+
+# 텍스트 레이어가 없는 (스캔) 페이지 OCR 설정
+OCR_ENABLED = os.getenv("DOCUMENTS_OPENAI_OCR", "true").lower() == "true"
+OCR_DPI = int(os.getenv("DOCUMENTS_OPENAI_OCR_DPI", "200"))
+OCR_LANG = os.getenv("DOCUMENTS_OPENAI_OCR_LANG", "kor+eng")
+# 동시에 렌더링/OCR 중인 페이지 수 (메모리에 올라가는 페이지 이미지 수 제한)
+OCR_MAX_INFLIGHT_PAGES = int(os.getenv("DOCUMENTS_OPENAI_OCR_MAX_INFLIGHT_PAGES", str(max(1, PDF_WORKERS) * 2)))
+
+
+def ocr_available() -> bool:
+    return OCR_ENABLED and fitz is not None and pytesseract is not None
+
+
+# 워커 프로세스에서 실행: 페이지 하나를 흑백 PNG로 렌더링하고 이미지 해시 계산
+def render_page_image(path: str, index: int, dpi: int = OCR_DPI) -> Tuple[str, bytes]:
+    with fitz.open(path) as doc:
+        pixmap = doc.load_page(index).get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+        png = pixmap.tobytes("png")
+    return hashlib.sha256(png).hexdigest(), png
+
+
+# 워커 프로세스에서 실행: 풀이 코어 수만큼 프로세스를 띄우므로 tesseract 내부 스레드는 1개로 제한
+def ocr_page_image(png: bytes, lang: str = OCR_LANG) -> str:
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    with Image.open(io.BytesIO(png)) as image:
+        return clean_page_text(pytesseract.image_to_string(image, lang=lang) or "")
+
+
+# 텍스트가 빈 페이지만 골라 렌더링 + OCR (PDF 추출과 같은 프로세스 풀 사용)
+# 같은 이미지는 캐시와 진행 중 작업을 공유하여 한 번만 OCR
+async def ocr_missing_pages(path: str, pages: List[str]) -> List[str]:
+    missing = [idx for idx, page in enumerate(pages) if not page]
+    if not missing or not ocr_available():
+        return pages
+
+    loop = asyncio.get_running_loop()
+    pool = get_pdf_pool()
+    cache = OcrResultCache.getInstance()
+    semaphore = asyncio.Semaphore(max(1, OCR_MAX_INFLIGHT_PAGES))
+    inflight: Dict[str, asyncio.Future] = {}
+    cache_hits = 0
+
+    async def ocr_page(idx: int) -> str:
+        nonlocal cache_hits
+        async with semaphore:
+            image_hash, png = await loop.run_in_executor(pool, render_page_image, path, idx, OCR_DPI)
+
+            text = await cache.get(image_hash, OCR_LANG)
+            if text is not None:
+                cache_hits += 1
+                return text
+            if image_hash in inflight:
+                cache_hits += 1
+                return await inflight[image_hash]
+
+            future = inflight[image_hash] = loop.run_in_executor(pool, ocr_page_image, png, OCR_LANG)
+            try:
+                text = await future
+            finally:
+                inflight.pop(image_hash, None)
+            await cache.set(image_hash, OCR_LANG, text)
+            return text
+
+    texts = await asyncio.gather(*(ocr_page(idx) for idx in missing))
+    record_chunks(len(missing), reused=cache_hits)
+
+    pages = list(pages)
+    for idx, text in zip(missing, texts):
+        pages[idx] = text
+    print(f"[OCR] {len(missing)} text-less pages, {cache_hits} from cache")
+    return pages
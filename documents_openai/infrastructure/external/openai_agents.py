@@ -0,0 +1,280 @@
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from documents_openai.infrastructure.external.chunk_index import ChunkIndexStore
+from documents_openai.infrastructure.external.llm_client import ask_gpt, embed_texts
+from documents_openai.infrastructure.external.ocr_extractor import ocr_missing_pages
+from documents_openai.infrastructure.external.pdf_extractor import extract_pages
+from documents_openai.infrastructure.external.stage_metrics import track_stage, record_chunks, record_queue_wait
+from documents_openai.infrastructure.external.token_budget import TokenBudget
+from documents_openai.infrastructure.external.tokenizer import count_tokens
+
+# 청크 요약 동시 실행 설정
+SUMMARY_CONCURRENCY = int(os.getenv("DOCUMENTS_OPENAI_SUMMARY_CONCURRENCY", "8"))
+SUMMARY_MAX_INFLIGHT_TOKENS = int(os.getenv("DOCUMENTS_OPENAI_MAX_INFLIGHT_TOKENS", "40000"))
+CHUNK_SUMMARY_MAX_TOKENS = 400
+
+# 검색 기반 QA에서 가져올 청크 수
+RETRIEVAL_TOP_K = int(os.getenv("DOCUMENTS_OPENAI_RETRIEVAL_TOP_K", "5"))
+
+# 계층 요약(reduce tree) 설정: 한 번에 합칠 부분 요약 수와 합치는 프롬프트의 토큰 상한
+REDUCE_FAN_IN = max(2, int(os.getenv("DOCUMENTS_OPENAI_REDUCE_FAN_IN", "8")))
+REDUCE_MAX_INPUT_TOKENS = int(os.getenv("DOCUMENTS_OPENAI_REDUCE_MAX_INPUT_TOKENS", "16000"))
+
+# 이 토큰 수 이하의 문서는 청킹 없이 요약 + QA + 감성 분석을 한 번의 호출로 처리
+SINGLE_PASS_MAX_TOKENS = int(os.getenv("DOCUMENTS_OPENAI_SINGLE_PASS_MAX_TOKENS", "16000"))
+SINGLE_PASS_OUTPUT_TOKENS = 1200
+
+# PDF 페이지별 텍스트 추출 (프로세스 풀에서 페이지 구간 병렬 처리, 이벤트 루프를 막지 않음)
+# 텍스트 레이어가 없는 스캔 페이지는 OCR로 채움
+@track_stage("extract")
+async def extract_pages_from_pdf_clean(path: str) -> List[str]:
+    try:
+        pages = await extract_pages(path)
+    except Exception as e:
+        raise ValueError(f"PDF parsing error: {str(e)}")
+    record_chunks(len(pages))
+    return await ocr_textless_pages(path, pages)
+
+
+@track_stage("ocr")
+async def ocr_textless_pages(path: str, pages: List[str]) -> List[str]:
+    try:
+        return await ocr_missing_pages(path, pages)
+    except Exception as e:
+        raise ValueError(f"OCR error: {str(e)}")
+
+
+# 부분 요약들을 순서를 유지하며 fan-in 개수 / 토큰 상한 단위의 그룹으로 나눔
+def group_summaries(summaries: List[str], fan_in: int = REDUCE_FAN_IN, max_tokens: int = REDUCE_MAX_INPUT_TOKENS) -> List[List[str]]:
+    groups, cur, cur_tokens = [], [], 0
+    for summary in summaries:
+        n = count_tokens(summary) + 1
+        if cur and (len(cur) >= fan_in or cur_tokens + n > max_tokens):
+            groups.append(cur)
+            cur, cur_tokens = [], 0
+        cur.append(summary)
+        cur_tokens += n
+    if cur:
+        groups.append(cur)
+
+    # 모든 그룹이 1개짜리라면(개별 요약이 토큰 상한보다 큰 경우) 최소 2개씩 묶어 트리가 줄어들도록 보장
+    if len(groups) == len(summaries) and len(summaries) > 1:
+        groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+    return groups
+
+
+# 문서 요약 에이전트 (섹션 요약 -> 계층적 통합 요약 -> 전체 요약)
+@track_stage("summarize")
+async def summarize_document(
+    chunks: List[str],
+    concurrency: int = SUMMARY_CONCURRENCY,
+    max_inflight_tokens: int = SUMMARY_MAX_INFLIGHT_TOKENS,
+    on_partial: Optional[Callable[[int, str], None]] = None,
+    fan_in: int = REDUCE_FAN_IN,
+    known_partials: Optional[Dict[int, str]] = None
+) -> str:
+    """known_partials: 이미 요약된 청크(인덱스 -> 요약)는 다시 호출하지 않고 그대로 사용"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    budget = TokenBudget(max_inflight_tokens)
+    fan_in = max(2, fan_in)
+
+    # 동시 요청 수와 in-flight 토큰(프롬프트 + 응답 상한)을 함께 제한
+    async def bounded_ask(prompt: str, max_tokens: int) -> str:
+        queued = time.perf_counter()
+        async with semaphore, budget.reserve(count_tokens(prompt) + max_tokens):
+            record_queue_wait(time.perf_counter() - queued)
+            return await ask_gpt(prompt, max_tokens=max_tokens)
+
+    known_partials = known_partials or {}
+
+    async def summarize_chunk(idx: int, chunk: str) -> str:
+        if idx in known_partials:
+            if on_partial is not None:
+                on_partial(idx, known_partials[idx])
+            return known_partials[idx]
+
+        prompt = f"""
+다음은 문서의 일부이다. 이 문단을 핵심 내용만 유지하며 간결하게 요약해라.
+
+문단({idx+1}):
+{chunk}
+"""
+        summary = await bounded_ask(prompt, CHUNK_SUMMARY_MAX_TOKENS)
+
+        # 스트리밍 모드에서는 청크 요약이 끝나는 대로 전달
+        if on_partial is not None:
+            on_partial(idx, summary)
+        return summary
+
+    async def reduce_group(group: List[str]) -> str:
+        prompt = f"""
+다음은 문서의 연속된 부분들에 대한 요약문이다. 순서와 핵심 내용을 유지하며 하나의 요약으로 통합해라.
+
+내용:
+{chr(10).join(group)}
+"""
+        return (await bounded_ask(prompt, CHUNK_SUMMARY_MAX_TOKENS)).strip()
+
+    record_chunks(len(chunks), reused=sum(1 for idx in known_partials if idx < len(chunks)))
+
+    # gather는 입력 순서대로 결과를 반환하므로 청크 순서가 유지됨
+    partial_summaries = await asyncio.gather(
+        *(summarize_chunk(idx, chunk) for idx, chunk in enumerate(chunks))
+    )
+
+    # 한 번의 최종 요약에 담기에 많으면 그룹 단위로 병렬 통합을 반복 (트리 깊이 = log_fan_in(청크 수))
+    level = list(partial_summaries)
+    while len(group_summaries(level, fan_in)) > 1:
+        level = list(await asyncio.gather(
+            *(reduce_group(group) for group in group_summaries(level, fan_in))
+        ))
+
+    merged = "\n".join(level)
+
+    # 전체 요약
+    final_prompt = f"""
+다음은 여러 요약문을 결합한 것이다. 이 내용을 다시 한 번 전체 핵심만 유지하며 통합 요약해라.
+
+내용:
+{merged}
+
+출력 형식:
+- 전체 요약 1개 문단
+"""
+    final_summary = await ask_gpt(final_prompt, max_tokens=500)
+    return final_summary.strip()
+
+# QA 에이전트
+@track_stage("qa")
+async def qa_on_document(summary: str, question: str) -> str:
+    prompt = f"""
+다음은 문서 요약이다. 이 요약 내의 정보만 사용하여 질문에 답해라.
+
+요약:
+{summary}
+
+질문:
+{question}
+
+규칙:
+- 추론하지 말고 요약 내에서만 답을 찾아라.
+- 없으면 "문서에 해당 정보 없음"이라고 답해라.
+"""
+    return (await ask_gpt(prompt, max_tokens=300)).strip()
+
+# 검색 기반 QA 에이전트 (요약 없이 질문과 관련된 원문 청크만 사용, LLM 호출 1회)
+@track_stage("qa_retrieval")
+async def qa_on_chunks(doc_hash: str, text: str, question: str, top_k: int = RETRIEVAL_TOP_K) -> str:
+    chunk_index = await ChunkIndexStore.getInstance().get_or_build(doc_hash, text)
+    query_embedding = (await embed_texts([question]))[0]
+    hits = chunk_index.search(query_embedding, top_k)
+    record_chunks(len(hits))
+
+    # 문서 내 순서대로 배치하여 문맥이 자연스럽게 이어지도록 함
+    context = "\n\n".join(f"[발췌 {idx+1}]\n{chunk}" for idx, _, chunk in sorted(hits))
+    prompt = f"""
+다음은 문서에서 질문과 관련된 부분을 발췌한 것이다. 이 발췌 내의 정보만 사용하여 질문에 답해라.
+
+발췌:
+{context}
+
+질문:
+{question}
+
+규칙:
+- 추론하지 말고 발췌 내에서만 답을 찾아라.
+- 없으면 "문서에 해당 정보 없음"이라고 답해라.
+"""
+    return (await ask_gpt(prompt, max_tokens=300)).strip()
+
+# 감성 분석 + 키포인트 에이전트
+@track_stage("opinions")
+async def analyze_opinions(summary: str) -> dict:
+    prompt = f"""
+다음 문서 요약에 대해 감성 분석과 핵심 포인트 추출을 수행해라.
+
+요약:
+{summary}
+
+출력 형식(JSON):
+{{
+    "sentiment": "positive | negative | neutral",
+    "key_points": ["핵심 문장1", "핵심 문장2", ... 5개]
+}}
+"""
+    raw = await ask_gpt(prompt, max_tokens=300)
+
+    try:
+        return json.loads(raw)
+    except:
+        return {"sentiment": "unknown", "key_points": []}
+
+# 단일 호출 에이전트 (한 프롬프트에 들어가는 작은 문서: 요약 + QA + 감성 분석)
+# 응답을 해석하지 못하면 None을 반환하여 호출 측이 기존 경로로 처리하도록 함
+@track_stage("single_pass")
+async def analyze_small_document(text: str, question: str) -> Optional[dict]:
+    prompt = f"""
+다음은 문서 전문이다. 이 문서 내의 정보만 사용하여 아래 작업을 한 번에 수행해라.
+
+문서:
+{text}
+
+질문:
+{question}
+
+작업:
+1. 문서 전체 핵심만 유지한 요약 1개 문단
+2. 질문에 대한 답변 (추론하지 말고 문서 내에서만 답을 찾고, 없으면 "문서에 해당 정보 없음")
+3. 감성 분석과 핵심 포인트 5개
+
+출력 형식(JSON만 출력):
+{{
+    "summary": "요약 문단",
+    "answer": "질문에 대한 답변",
+    "sentiment": "positive | negative | neutral",
+    "key_points": ["핵심 문장1", "핵심 문장2", ... 5개]
+}}
+"""
+    record_chunks(1)
+    raw = (await ask_gpt(prompt, max_tokens=SINGLE_PASS_OUTPUT_TOKENS)).strip()
+    if raw.startswith("```"):
+        raw = raw.strip("`").removeprefix("json").strip()
+
+    try:
+        result = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(result, dict) or not result.get("summary") or not result.get("answer"):
+        return None
+    return {
+        "summary": str(result["summary"]).strip(),
+        "answer": str(result["answer"]).strip(),
+        "analysis": {
+            "sentiment": result.get("sentiment", "unknown"),
+            "key_points": result.get("key_points", [])
+        }
+    }
+
+# 문서 간 통합 답변 에이전트 (배치 분석: 문서별 답변을 근거로 하나의 답변 작성)
+@track_stage("consolidate")
+async def consolidate_answers(question: str, document_answers: List[tuple]) -> str:
+    answers = "\n\n".join(f"[{name}]\n{answer}" for name, answer in document_answers)
+    prompt = f"""
+다음은 여러 문서에 같은 질문을 하여 얻은 문서별 답변이다. 이 답변들만 사용하여 질문에 대한 통합 답변을 작성해라.
+
+질문:
+{question}
+
+문서별 답변:
+{answers}
+
+규칙:
+- 문서 간 공통점과 차이점을 드러내고, 근거가 된 문서 이름을 함께 적어라.
+- "문서에 해당 정보 없음"인 문서는 근거로 사용하지 마라.
+- 모든 문서에 정보가 없으면 "문서에 해당 정보 없음"이라고 답해라.
+"""
+    return (await ask_gpt(prompt, max_tokens=800)).strip()
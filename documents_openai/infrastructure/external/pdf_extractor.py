@@ -0,0 +1,99 @@
+import asyncio
+import mmap
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from pypdf import PdfReader
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+# 프로세스 풀 크기와 워커 하나가 맡을 페이지 수
+PDF_WORKERS = int(os.getenv("DOCUMENTS_OPENAI_PDF_WORKERS", str(os.cpu_count() or 1)))
+PDF_PAGES_PER_TASK = int(os.getenv("DOCUMENTS_OPENAI_PDF_PAGES_PER_TASK", "16"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # 웹 워커는 이미 여러 스레드(HTTP 풀, to_thread, prefork 시 torch)를 갖고 있어 fork하면 자식이 교착될 수 있으므로 spawn 사용
+        _pool = ProcessPoolExecutor(max_workers=max(1, PDF_WORKERS), mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_pdf_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+# 페이지 텍스트 정리
+def clean_page_text(t: str) -> str:
+    t = re.sub(r'\s+', ' ', t)                # 공백 정리
+    t = re.sub(r'\d+\s*$', '', t)            # 페이지 번호 제거
+    return t.strip()
+
+
+# 워커 프로세스에는 바이트 대신 파일 경로만 전달 (업로드 크기와 무관하게 복사 비용 일정)
+def count_pages(path: str) -> int:
+    if fitz is not None:
+        try:
+            with fitz.open(path) as doc:
+                return doc.page_count
+        except Exception:
+            pass
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        return len(PdfReader(view).pages)
+
+
+def _extract_range_pymupdf(path: str, start: int, end: int) -> List[str]:
+    with fitz.open(path) as doc:
+        return [clean_page_text(doc.load_page(i).get_text("text") or "") for i in range(start, end)]
+
+
+def _extract_range_pypdf(path: str, start: int, end: int) -> List[str]:
+    # 파일 전체를 읽지 않고 메모리 맵으로 파싱
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        reader = PdfReader(view)
+        return [clean_page_text(reader.pages[i].extract_text() or "") for i in range(start, end)]
+
+
+# 워커 프로세스에서 실행: 페이지 구간 [start, end) 추출 + 정리 (PyMuPDF 우선, 실패 시 pypdf)
+def extract_page_range(path: str, start: int, end: int) -> List[str]:
+    if fitz is not None:
+        try:
+            return _extract_range_pymupdf(path, start, end)
+        except Exception:
+            pass
+    return _extract_range_pypdf(path, start, end)
+
+
+def split_page_ranges(page_count: int, pages_per_task: int = PDF_PAGES_PER_TASK) -> List[Tuple[int, int]]:
+    step = max(1, pages_per_task)
+    return [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+
+# 페이지 순서를 유지한 페이지별 텍스트 (텍스트가 없는 페이지는 빈 문자열)
+async def extract_pages(path: str) -> List[str]:
+    loop = asyncio.get_running_loop()
+    pool = get_pdf_pool()
+
+    page_count = await loop.run_in_executor(pool, count_pages, path)
+    ranges = split_page_ranges(page_count)
+    results = await asyncio.gather(
+        *(loop.run_in_executor(pool, extract_page_range, path, start, end) for start, end in ranges)
+    )
+    return [page for pages in results for page in pages]
+
+
+def join_pages(pages: List[str]) -> str:
+    return "\n".join(p for p in pages if p)
+
@@ -0,0 +1,185 @@
+import functools
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+# 단계별 통계에 유지할 최근 실행 수 (p50/p95 계산용)
+STAGE_STATS_WINDOW = int(os.getenv("DOCUMENTS_OPENAI_STAGE_STATS_WINDOW", "1000"))
+
+
+@dataclass
+class StageMetrics:
+    """단계 한 번(또는 요청 내 합계)의 측정값"""
+    calls: int = 0
+    wall_ms: float = 0.0
+    queue_wait_ms: float = 0.0
+    llm_calls: int = 0
+    cached_llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    chunks: int = 0
+    reused_chunks: int = 0
+
+    def merge(self, other: "StageMetrics"):
+        self.calls += other.calls
+        self.wall_ms += other.wall_ms
+        self.queue_wait_ms += other.queue_wait_ms
+        self.llm_calls += other.llm_calls
+        self.cached_llm_calls += other.cached_llm_calls
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.chunks += other.chunks
+        self.reused_chunks += other.reused_chunks
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["wall_ms"] = round(self.wall_ms, 1)
+        data["queue_wait_ms"] = round(self.queue_wait_ms, 1)
+        return data
+
+
+class RequestMetrics:
+    """요청 하나에서 실행된 단계들의 측정값"""
+
+    def __init__(self):
+        self.stages: Dict[str, StageMetrics] = {}
+
+    def merge(self, name: str, metrics: StageMetrics):
+        self.stages.setdefault(name, StageMetrics()).merge(metrics)
+
+    def to_dict(self) -> dict:
+        total = StageMetrics()
+        for metrics in self.stages.values():
+            total.merge(metrics)
+        return {
+            "stages": {name: metrics.to_dict() for name, metrics in self.stages.items()},
+            "prompt_tokens": total.prompt_tokens,
+            "completion_tokens": total.completion_tokens,
+            "llm_calls": total.llm_calls,
+            "cached_llm_calls": total.cached_llm_calls
+        }
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class StageStatsAggregator:
+    """프로세스 내 단계별 누적 통계"""
+
+    def __init__(self, window: int = STAGE_STATS_WINDOW):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, StageMetrics] = defaultdict(StageMetrics)
+        self._wall_ms: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._queue_wait_ms: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, name: str, metrics: StageMetrics):
+        with self._lock:
+            self._totals[name].merge(metrics)
+            self._wall_ms[name].append(metrics.wall_ms)
+            self._queue_wait_ms[name].append(metrics.queue_wait_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {}
+            for name, total in self._totals.items():
+                calls = max(1, total.calls)
+                wall = list(self._wall_ms[name])
+                wait = list(self._queue_wait_ms[name])
+                stages[name] = {
+                    "calls": total.calls,
+                    "wall_ms": {
+                        "avg": round(total.wall_ms / calls, 1),
+                        "p50": round(_percentile(wall, 0.5), 1),
+                        "p95": round(_percentile(wall, 0.95), 1),
+                        "max": round(max(wall), 1) if wall else 0.0
+                    },
+                    "queue_wait_ms": {
+                        "avg": round(total.queue_wait_ms / calls, 1),
+                        "p95": round(_percentile(wait, 0.95), 1)
+                    },
+                    "llm_calls": total.llm_calls,
+                    "cached_llm_calls": total.cached_llm_calls,
+                    "prompt_tokens": total.prompt_tokens,
+                    "completion_tokens": total.completion_tokens,
+                    "avg_chunks": round(total.chunks / calls, 1),
+                    "reused_chunks": total.reused_chunks
+                }
+        return {"pid": os.getpid(), "stages": stages}
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+            self._wall_ms.clear()
+            self._queue_wait_ms.clear()
+
+
+stage_stats = StageStatsAggregator()
+
+_current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("documents_openai_request_metrics", default=None)
+_current_stage: ContextVar[Optional[StageMetrics]] = ContextVar("documents_openai_stage_metrics", default=None)
+
+
+# 요청 단위 측정 범위 (이 안에서 생성된 태스크들은 contextvar를 물려받음)
+@contextmanager
+def collect_request_metrics():
+    metrics = RequestMetrics()
+    token = _current_request.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_request.reset(token)
+
+
+# 비동기 단계 함수 계측 데코레이터: 실행 시간 + 내부에서 기록된 토큰/대기/청크 수 집계
+def track_stage(name: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            metrics = StageMetrics(calls=1)
+            token = _current_stage.set(metrics)
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                metrics.wall_ms = (time.perf_counter() - started) * 1000
+                _current_stage.reset(token)
+                request = _current_request.get()
+                if request is not None:
+                    request.merge(name, metrics)
+                stage_stats.record(name, metrics)
+        return wrapper
+    return decorator
+
+
+def record_llm_usage(prompt_tokens: int = 0, completion_tokens: int = 0, cached: bool = False):
+    metrics = _current_stage.get()
+    if metrics is None:
+        return
+    if cached:
+        metrics.cached_llm_calls += 1
+    else:
+        metrics.llm_calls += 1
+        metrics.prompt_tokens += prompt_tokens or 0
+        metrics.completion_tokens += completion_tokens or 0
+
+
+def record_queue_wait(seconds: float):
+    metrics = _current_stage.get()
+    if metrics is not None:
+        metrics.queue_wait_ms += seconds * 1000
+
+
+def record_chunks(count: int, reused: int = 0):
+    metrics = _current_stage.get()
+    if metrics is not None:
+        metrics.chunks += count
+        metrics.reused_chunks += reused
@@ -0,0 +1,29 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class TokenBudget:
+    """동시에 처리 중인(in-flight) 토큰 수의 상한을 관리"""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def reserve(self, tokens: int):
+        # 상한보다 큰 단일 요청은 상한만큼 예약하여 단독으로라도 실행되도록 함
+        tokens = min(max(1, tokens), self.limit)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight + tokens <= self.limit)
+            self._in_flight += tokens
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._in_flight -= tokens
+                self._cond.notify_all()
@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import List, Optional
+
+import tiktoken
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: Optional[str] = None) -> tiktoken.Encoding:
+    if model is None:
+        # llm_client도 토큰 수 계산에 이 모듈을 쓰므로 순환 import를 피해 사용 시점에 가져옴
+        from documents_openai.infrastructure.external.llm_client import DOCUMENTS_OPENAI_MODEL
+        model = DOCUMENTS_OPENAI_MODEL
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # tiktoken이 모르는 모델명이면 최신 GPT 계열 인코딩 사용
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str) -> int:
+    return len(get_encoding().encode(text, disallowed_special=()))
+
+
+def encode(text: str) -> List[int]:
+    return get_encoding().encode(text, disallowed_special=())
+
+
+def decode(tokens: List[int]) -> str:
+    return get_encoding().decode(tokens)
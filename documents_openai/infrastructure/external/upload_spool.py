@@ -0,0 +1,46 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+import aiofiles
+from fastapi import UploadFile
+
+# 업로드를 나눠 읽을 크기 (요청당 메모리 사용량 상한)
+UPLOAD_CHUNK_SIZE = int(os.getenv("DOCUMENTS_OPENAI_UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+UPLOAD_TMP_DIR = os.getenv("DOCUMENTS_OPENAI_UPLOAD_TMP_DIR") or None
+
+
+@dataclass
+class SpooledUpload:
+    """임시 파일로 내려받은 업로드 (파싱은 경로/mmap으로 수행)"""
+    path: str
+    sha256: str
+    size: int
+
+    def cleanup(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+# 업로드 본문을 청크 단위로 임시 파일에 기록하면서 SHA-256을 점진적으로 계산
+async def spool_upload(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> SpooledUpload:
+    fd, path = tempfile.mkstemp(prefix="documents_openai_", suffix=".pdf", dir=UPLOAD_TMP_DIR)
+    os.close(fd)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                digest.update(chunk)
+                size += len(chunk)
+                await out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return SpooledUpload(path=path, sha256=digest.hexdigest(), size=size)
+
@@ -0,0 +1,123 @@
+import json
+import os
+import time
+from typing import Optional
+
+from config.redis_config import get_redis
+from documents_openai.application.port.analysis_job_queue_port import AnalysisJobQueuePort
+from documents_openai.domain.analysis_job import AnalysisJob
+
+JOB_TTL_SECONDS = int(os.getenv("DOCUMENTS_OPENAI_JOB_TTL_SECONDS", str(24 * 3600)))
+# 처리 중인 작업의 점유 기간 (워커가 주기적으로 연장하며, 만료된 작업은 다른 워커가 주기적으로 대기열로 되돌림)
+JOB_LEASE_SECONDS = int(os.getenv("DOCUMENTS_OPENAI_JOB_LEASE_SECONDS", "60"))
+
+PENDING_KEY = "documents_openai:jobs:pending"
+PROCESSING_KEY = "documents_openai:jobs:processing"
+
+
+class AnalysisJobQueueImpl(AnalysisJobQueuePort):
+    """Redis 기반 분석 작업 큐
+
+    - 작업 상태: documents_openai:job:<id> (JSON, TTL)
+    - 대기열: pending 리스트에서 processing 리스트로 원자적으로 옮겨 가져가며,
+      처리가 끝나면 processing에서 제거
+    - 가져간 작업에는 점유 키(documents_openai:job:<id>:lease, TTL)를 두고 처리하는 동안 연장하며,
+      워커가 죽어 점유가 만료된 작업은 recover_stale()로 pending에 되돌려 다시 처리
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.redis = get_redis()
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"documents_openai:job:{job_id}"
+
+    @staticmethod
+    def _lease_key(job_id: str) -> str:
+        return f"documents_openai:job:{job_id}:lease"
+
+    def save(self, job: AnalysisJob) -> AnalysisJob:
+        self.redis.set(self._job_key(job.job_id), json.dumps(job.to_dict(), ensure_ascii=False), ex=JOB_TTL_SECONDS)
+        return job
+
+    def enqueue(self, job: AnalysisJob) -> AnalysisJob:
+        self.save(job)
+        self.redis.lpush(PENDING_KEY, job.job_id)
+        return job
+
+    # pending -> processing 이동과 점유 키 설정을 한 트랜잭션으로 수행
+    # (둘 사이에 recover_stale()이 점유 없는 작업으로 보고 되돌리지 않도록, 다른 워커가 먼저 가져가면 WATCH로 재시도)
+    def _claim(self) -> Optional[str]:
+        def claim(pipe) -> Optional[str]:
+            job_id = pipe.lindex(PENDING_KEY, -1)
+            if job_id is None:
+                return None
+            pipe.multi()
+            pipe.lmove(PENDING_KEY, PROCESSING_KEY, "RIGHT", "LEFT")
+            pipe.set(self._lease_key(job_id), os.getpid(), ex=JOB_LEASE_SECONDS)
+            return job_id
+
+        return self.redis.transaction(claim, PENDING_KEY, value_from_callable=True)
+
+    def dequeue(self, timeout: int) -> Optional[AnalysisJob]:
+        deadline = time.monotonic() + timeout
+        job_id = self._claim()
+        while job_id is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            # 작업이 들어올 때까지 블로킹 대기 (꺼낸 작업은 같은 자리에 되돌려 두고 _claim으로 가져감)
+            if self.redis.blmove(PENDING_KEY, PENDING_KEY, remaining, "RIGHT", "RIGHT") is None:
+                return None
+            job_id = self._claim()
+
+        job = self.find_by_id(job_id)
+        if job is None:
+            # 상태가 만료된 작업은 버림
+            self.acknowledge_id(job_id)
+        return job
+
+    def renew(self, job: AnalysisJob):
+        self.redis.set(self._lease_key(job.job_id), os.getpid(), ex=JOB_LEASE_SECONDS)
+
+    def acknowledge(self, job: AnalysisJob):
+        self.acknowledge_id(job.job_id)
+
+    def acknowledge_id(self, job_id: str):
+        self.redis.lrem(PROCESSING_KEY, 1, job_id)
+        self.redis.delete(self._lease_key(job_id))
+
+    # processing에 남아 있지만 점유가 만료된 작업(처리하던 워커가 죽은 작업)을 다음 차례로 되돌림
+    def recover_stale(self) -> int:
+        recovered = 0
+        for job_id in self.redis.lrange(PROCESSING_KEY, 0, -1):
+            if self.redis.exists(self._lease_key(job_id)):
+                continue
+            # LREM에 성공한 워커만 되돌려 여러 워커가 동시에 기동해도 한 번만 다시 넣음
+            if self.redis.lrem(PROCESSING_KEY, 1, job_id):
+                self.redis.rpush(PENDING_KEY, job_id)
+                recovered += 1
+        return recovered
+
+    def find_by_id(self, job_id: str) -> Optional[AnalysisJob]:
+        raw = self.redis.get(self._job_key(job_id))
+        if raw is None:
+            return None
+        return AnalysisJob.from_dict(json.loads(raw))
+
+    def pending_count(self) -> int:
+        return self.redis.llen(PENDING_KEY)
+
+    def processing_count(self) -> int:
+        return self.redis.llen(PROCESSING_KEY)
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from documents_openai.infrastructure.external import chunker
+
+TARGET_TOKENS = 4000
+OVERLAP_TOKENS = 200
+
+
+@pytest.fixture(autouse=True)
+def word_tokenizer(monkeypatch):
+    # tiktoken 인코딩 파일 없이도 돌도록 공백 단위 토큰으로 대체
+    monkeypatch.setattr(chunker, "count_tokens", lambda text: len(text.split()))
+    monkeypatch.setattr(chunker, "encode", lambda text: text.split())
+    monkeypatch.setattr(chunker, "decode", lambda tokens: " ".join(tokens))
+
+
+def make_pages(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(count):
+        sentences = [
+            " ".join(f"w{rng.randint(0, 9999)}" for _ in range(rng.randint(8, 20))) + "."
+            for _ in range(rng.randint(15, 30))
+        ]
+        pages.append(" ".join(sentences))
+    return pages
+
+
+def chunk_tokens(chunk) -> int:
+    return len(chunk.text.split())
+
+
+def test_chunks_are_filled_before_content_boundaries():
+    pages = make_pages(200)
+    chunks = chunker.chunk_pages(pages, TARGET_TOKENS, OVERLAP_TOKENS)
+
+    # 마지막 청크를 제외하면 모두 목표의 절반 이상, 목표 이하
+    for chunk in chunks[:-1]:
+        assert TARGET_TOKENS * chunker.CHUNK_BOUNDARY_MIN_FILL <= chunk_tokens(chunk) <= TARGET_TOKENS
+
+    total = sum(len(page.split()) for page in pages)
+    assert len(chunks) <= 2 * total / TARGET_TOKENS + 1
+
+
+def test_chunks_cover_pages_in_order():
+    pages = make_pages(120)
+    chunks = chunker.chunk_pages(pages, TARGET_TOKENS, OVERLAP_TOKENS)
+
+    assert chunks[0].start_page == 0
+    assert chunks[-1].end_page == len(pages)
+    for prev, cur in zip(chunks, chunks[1:]):
+        assert prev.end_page == cur.start_page
+
+
+def test_edit_keeps_later_chunks():
+    pages = make_pages(200)
+    before = chunker.chunk_pages(pages, TARGET_TOKENS, OVERLAP_TOKENS)
+
+    edited = list(pages)
+    edited[20] = edited[20] + " An added closing sentence."
+    after = chunker.chunk_pages(edited, TARGET_TOKENS, OVERLAP_TOKENS)
+
+    before_hashes = {chunk.content_hash for chunk in before}
+    reused = [chunk for chunk in after if chunk.content_hash in before_hashes]
+    changed = [chunk for chunk in after if chunk.content_hash not in before_hashes]
+
+    # 수정한 페이지 주변 몇 개 청크만 새로 요약하면 됨
+    assert len(changed) <= 3
+    assert len(reused) >= len(after) - 3
+    assert all(chunk.start_page <= 20 + 3 * chunker.CHUNK_BOUNDARY_PAGES for chunk in changed)